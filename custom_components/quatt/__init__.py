@@ -6,8 +6,15 @@ https://github.com/marcoboers/home-assistant-quatt
 
 from __future__ import annotations
 
+import asyncio
 from datetime import timedelta
+from functools import partial
+from typing import Any
 
+import aiohttp
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
 from homeassistant.components.frontend import add_extra_js_url
 from homeassistant.components.http import StaticPathConfig
 from homeassistant.config_entries import ConfigEntry
@@ -34,6 +41,7 @@ from .api import (
 )
 from .api_local import QuattLocalApiClient
 from .api_remote import QuattRemoteApiClient
+from .auth import get_account_auth
 from .const import (
     CARD_FILE,
     CARD_MOUNT,
@@ -44,13 +52,20 @@ from .const import (
     DEFAULT_REMOTE_SCAN_INTERVAL,
     DEVICE_CIC_ID,
     DOMAIN,
+    INSIGHTS_REMOTE_SCAN_INTERVAL,
+    INSIGHTS_SERVICE_MAX_PARALLEL,
+    INSIGHTS_STORAGE_KEY,
     LOGGER,
     REMOTE_CONF_SCAN_INTERVAL,
     STORAGE_KEY,
     STORAGE_VERSION,
+    TRANSFER_STATS_STORAGE_KEY,
 )
+from .coordinator_insights import QuattInsightsDataUpdateCoordinator
 from .coordinator_local import QuattLocalDataUpdateCoordinator
 from .coordinator_remote import QuattRemoteDataUpdateCoordinator
+from .fleet import async_get_fleet
+from .request_scheduler import get_account_request_scheduler
 
 PLATFORMS: list[Platform] = [
     Platform.BINARY_SENSOR,
@@ -91,6 +106,9 @@ async def async_setup(hass: HomeAssistant, _config):
 
     # Register the frontend card
     add_extra_js_url(hass, f"{CARD_MOUNT}/js/{CARD_FILE}?v={version}")
+
+    # Serve the insights on demand, e.g. for charts
+    websocket_api.async_register_command(hass, websocket_get_insights)
     return True
 
 
@@ -99,11 +117,20 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up this integration using UI."""
     hass.data.setdefault(DOMAIN, {})
 
+    # Spread the polls of all entries so the CICs are not polled at the same time
+    fleet = async_get_fleet(hass)
+    fleet.async_add_entry(entry.entry_id)
+    entry.async_on_unload(partial(fleet.async_remove_entry, entry.entry_id))
+
     has_remote = CONF_REMOTE_CIC in entry.data
 
     coordinators: dict[
-        str, QuattLocalDataUpdateCoordinator | QuattRemoteDataUpdateCoordinator | None
-    ] = {"local": None, "remote": None}
+        str,
+        QuattLocalDataUpdateCoordinator
+        | QuattRemoteDataUpdateCoordinator
+        | QuattInsightsDataUpdateCoordinator
+        | None,
+    ] = {"local": None, "remote": None, "insights": None}
 
     local_client = QuattLocalApiClient(
         ip_address=entry.data[CONF_LOCAL_CIC],
@@ -118,6 +145,13 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         client=local_client,
     )
 
+    # Restore the integrated energy counters before the first sample is processed
+    await local_coordinator.async_load_energy()
+
+    # Cache the power sensor state so it is not parsed on every access
+    if unsub_power_sensor := local_coordinator.async_track_power_sensor():
+        entry.async_on_unload(unsub_power_sensor)
+
     await local_coordinator.async_config_entry_first_refresh()
     coordinators["local"] = local_coordinator
 
@@ -133,7 +167,26 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
         # Create remote API client
         session = async_get_clientsession(hass)
-        remote_client = QuattRemoteApiClient(cic, session, store)
+        insights_store = Store(
+            hass, STORAGE_VERSION, f"{INSIGHTS_STORAGE_KEY}_{entry.unique_id}"
+        )
+        transfer_store = Store(
+            hass, STORAGE_VERSION, f"{TRANSFER_STATS_STORAGE_KEY}_{entry.unique_id}"
+        )
+        remote_client = QuattRemoteApiClient(
+            cic,
+            session,
+            store,
+            insights_store,
+            transfer_store,
+            request_semaphore=fleet.remote_requests,
+        )
+        entry.async_on_unload(remote_client.cancel_background_tasks)
+
+        # Restore the cached insights so history is not fetched again after a restart
+        await remote_client.async_load_insights_cache()
+        # Continue the data usage of today after a restart
+        await remote_client.transfer_stats.async_load()
 
         # Load tokens if they exist
         if stored_data:
@@ -141,11 +194,17 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
                 stored_data.get("id_token"),
                 stored_data.get("refresh_token"),
                 stored_data.get("installation_id"),
+                stored_data.get("installation_id_updated_at"),
+                stored_data.get("firebase"),
             )
             LOGGER.debug("Loaded stored tokens for CIC %s", cic)
 
         # Authenticate (will use existing tokens if available, or do full auth)
         if await remote_client.authenticate():
+            # Share the account only once the tokens are known to be paired with
+            # this CIC, a full authentication results in another account
+            _share_account(hass, remote_client, session)
+
             # Create remote coordinator only if authentication succeeded
             remote_coordinator = QuattRemoteDataUpdateCoordinator(
                 hass=hass,
@@ -158,10 +217,27 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             )
 
             await remote_coordinator.async_config_entry_first_refresh()
+            entry.async_on_unload(remote_coordinator.settings_queue.cancel)
             coordinators["remote"] = remote_coordinator
+
+            # The insights have their own schedule, a failure does not block the setup
+            insights_coordinator = QuattInsightsDataUpdateCoordinator(
+                hass=hass,
+                update_interval=timedelta(minutes=INSIGHTS_REMOTE_SCAN_INTERVAL),
+                client=remote_client,
+                remote_coordinator=remote_coordinator,
+            )
+            await insights_coordinator.async_refresh()
+            coordinators["insights"] = insights_coordinator
         else:
             LOGGER.error("Failed to authenticate with Quatt remote API")
 
+    for coordinator in coordinators.values():
+        if coordinator and (
+            unsub_stagger := fleet.async_stagger(hass, entry.entry_id, coordinator)
+        ):
+            entry.async_on_unload(unsub_stagger)
+
     # Store coordinators
     hass.data[DOMAIN][entry.entry_id] = coordinators
 
@@ -173,34 +249,67 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     if not hass.services.has_service(DOMAIN, "get_insights"):
 
         async def handle_get_insights(call: ServiceCall) -> ServiceResponse:
-            """Handle the get_insights service call."""
-            from_date = call.data.get("from_date")
-            timeframe = call.data.get("timeframe", "all")
-            advanced_insights = call.data.get("advanced_insights", True)
+            """Handle the get_insights service call.
 
-            # Find a remote coordinator to use for the service call
-            remote_coordinator = None
-            for coordinators_dict in hass.data[DOMAIN].values():
-                if coordinators_dict.get("remote"):
-                    remote_coordinator = coordinators_dict["remote"]
-                    break
+            Either a single period (from_date, timeframe, advanced_insights) or a
+            list of periods (requests) is fetched. The periods of a list are fetched
+            concurrently and returned keyed by their key (default timeframe_from_date).
+            """
+            cic = call.data.get("cic")
 
+            # Find a remote coordinator to use for the service call
+            remote_coordinator = _find_remote_coordinator(hass, cic)
             if not remote_coordinator:
                 LOGGER.error("No remote coordinator available for insights service")
+                if cic is not None:
+                    return {"error": f"No remote connection available for CIC {cic}."}
                 return {
                     "error": "No remote connection available. Please configure remote API access."
                 }
 
-            # Get insights data
-            insights_data = await remote_coordinator.client.get_insights(
-                from_date=from_date,
-                timeframe=timeframe,
-                advanced_insights=advanced_insights,
-            )
+            client: QuattRemoteApiClient = remote_coordinator.client
 
-            if insights_data:
-                return insights_data
-            return {"error": "Failed to fetch insights data"}
+            if "requests" not in call.data:
+                # Get insights data
+                insights_data = await client.get_insights(
+                    from_date=call.data.get("from_date", "2020-01-01"),
+                    timeframe=call.data.get("timeframe", "all"),
+                    advanced_insights=call.data.get("advanced_insights", True),
+                )
+
+                if insights_data:
+                    return insights_data
+                return {"error": "Failed to fetch insights data"}
+
+            # The client shares the cache and identical requests, the semaphore
+            # limits the number of concurrent requests to the API
+            semaphore = asyncio.Semaphore(INSIGHTS_SERVICE_MAX_PARALLEL)
+
+            async def _async_get_insights(request: dict[str, Any]) -> dict[str, Any]:
+                """Get the insights of a single request of the list."""
+                async with semaphore:
+                    insights_data = await client.get_insights(
+                        from_date=request.get("from_date", "2020-01-01"),
+                        timeframe=request.get("timeframe", "all"),
+                        advanced_insights=request.get("advanced_insights", True),
+                    )
+                return insights_data or {"error": "Failed to fetch insights data"}
+
+            requests = call.data["requests"]
+            if not isinstance(requests, list) or not all(
+                isinstance(request, dict) for request in requests
+            ):
+                return {"error": "Requests must be a list of insights requests"}
+
+            keys = [
+                request.get("key")
+                or f"{request.get('timeframe', 'all')}_{request.get('from_date', '2020-01-01')}"
+                for request in requests
+            ]
+            results = await asyncio.gather(
+                *(_async_get_insights(request) for request in requests)
+            )
+            return {"insights": dict(zip(keys, results, strict=True))}
 
         hass.services.async_register(
             DOMAIN,
@@ -212,10 +321,81 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     return True
 
 
+def _share_account(
+    hass: HomeAssistant, client: QuattRemoteApiClient, session: aiohttp.ClientSession
+) -> None:
+    """Share the tokens and request limits of the account."""
+    if not (account_id := client.account_id):
+        return
+
+    client.use_account_auth(get_account_auth(hass, account_id, session))
+    client.request_scheduler = get_account_request_scheduler(hass, account_id)
+
+
+def _find_remote_coordinator(
+    hass: HomeAssistant, cic: str | None = None
+) -> QuattRemoteDataUpdateCoordinator | None:
+    """Find the remote coordinator of the CIC, or the first one without CIC."""
+    for coordinators_dict in hass.data.get(DOMAIN, {}).values():
+        coordinator = coordinators_dict.get("remote")
+        if coordinator and (cic is None or coordinator.client.cic == cic):
+            return coordinator
+    return None
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "quatt/insights",
+        vol.Optional("from_date", default="2020-01-01"): str,
+        vol.Optional("timeframe", default="all"): vol.In(
+            ["all", "day", "week", "month", "year"]
+        ),
+        vol.Optional("advanced_insights", default=False): bool,
+        vol.Optional("cic"): str,
+    }
+)
+@websocket_api.async_response
+async def websocket_get_insights(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Return the insights of a period, e.g. the full graph for a chart."""
+    remote_coordinator = _find_remote_coordinator(hass, msg.get("cic"))
+    if not remote_coordinator:
+        connection.send_error(
+            msg["id"], websocket_api.ERR_NOT_FOUND, "No remote connection available"
+        )
+        return
+
+    insights_data = await remote_coordinator.client.get_insights(
+        from_date=msg["from_date"],
+        timeframe=msg["timeframe"],
+        advanced_insights=msg["advanced_insights"],
+    )
+    if insights_data is None:
+        connection.send_error(
+            msg["id"], websocket_api.ERR_UNKNOWN_ERROR, "Failed to fetch insights data"
+        )
+        return
+
+    connection.send_result(msg["id"], insights_data)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Handle removal of an entry."""
     if unloaded := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
-        hass.data[DOMAIN].pop(entry.entry_id)
+        coordinators = hass.data[DOMAIN].pop(entry.entry_id)
+
+        # Persist the latest energy counters instead of waiting for the delayed save
+        await coordinators["local"].async_save_energy()
+
+        # Persist pending token, insights and data usage changes so a reload
+        # starts with them
+        if coordinators["remote"]:
+            await coordinators["remote"].client.async_flush_tokens()
+            await coordinators["remote"].client.async_save_insights_cache()
+            await coordinators["remote"].client.transfer_stats.async_save()
     return unloaded
 
 
@@ -3,37 +3,71 @@
 from __future__ import annotations
 
 import asyncio
-from datetime import datetime, timedelta, timezone
+from collections.abc import AsyncIterator, Callable
+from contextlib import AsyncExitStack, asynccontextmanager, nullcontext
+from datetime import date
 import json
 import logging
+import time
 from typing import Any
 
 import aiohttp
 
+import homeassistant.util.dt as dt_util
+
 from .api import QuattApiClient
+from .auth import TOKEN_EXPIRY_LEEWAY, QuattAccountAuth, firebase_headers
+from .conditional_cache import ConditionalCache, request_key
 from .const import (
     FIREBASE_ACCOUNT_INFO_URL,
     FIREBASE_INSTALLATIONS_URL,
+    FIREBASE_REMOTE_CONFIG_TTL,
     FIREBASE_REMOTE_CONFIG_URL,
     FIREBASE_SIGNUP_URL,
-    FIREBASE_TOKEN_URL,
     GOOGLE_ANDROID_CERT,
     GOOGLE_ANDROID_PACKAGE,
     GOOGLE_API_KEY,
     GOOGLE_APP_ID,
     GOOGLE_APP_INSTANCE_ID,
-    GOOGLE_CLIENT_VERSION,
     GOOGLE_FIREBASE_CLIENT,
-    INSIGHTS_REMOTE_SCAN_INTERVAL,
+    INSTALLATION_ID_TTL,
     QUATT_API_BASE_URL,
+    REMOTE_RETRY_AFTER_MAX,
+    TOKEN_SAVE_DELAY,
+)
+from .insights_cache import (
+    InsightsCache,
+    InsightsIncrement,
+    insights_period_end,
+    merge_day_insights,
 )
+from .request_scheduler import (
+    QuattRequestScheduler,
+    RequestPriority,
+    parse_retry_after,
+)
+from .transfer_stats import ACCEPT_ENCODING, TransferStats
 
 PAIRING_TIMEOUT = 60  # Seconds to wait for button press
-PAIRING_CHECK_INTERVAL = 2  # Seconds between checks
+PAIRING_CHECK_INTERVAL = 0.5  # Seconds before the first check
+PAIRING_CHECK_MAX_INTERVAL = 4  # Maximum seconds between checks
+PAIRING_CHECK_BACKOFF = 1.5  # Growth of the interval after every check
+INCREMENTAL_TIMEFRAMES = ("week", "month")  # Timeframes with a bucket per day
 
 _LOGGER = logging.getLogger(__name__)
 
 
+def _installation_has_cic(installation: Any, cic: str) -> bool:
+    """Check if the CIC is referenced anywhere in the installation."""
+    if isinstance(installation, str):
+        return installation == cic
+    if isinstance(installation, dict):
+        return any(_installation_has_cic(value, cic) for value in installation.values())
+    if isinstance(installation, list):
+        return any(_installation_has_cic(value, cic) for value in installation)
+    return False
+
+
 class QuattRemoteApiClient(QuattApiClient):
     """Remote Quatt API Client (via mobile API)."""
 
@@ -42,51 +76,280 @@ class QuattRemoteApiClient(QuattApiClient):
         cic: str,
         session: aiohttp.ClientSession,
         store=None,
+        insights_store=None,
+        transfer_store=None,
+        request_scheduler: QuattRequestScheduler | None = None,
+        request_semaphore: asyncio.Semaphore | None = None,
     ) -> None:
         """Initialize the remote API client."""
         self.cic = cic
         self._session = session
+        # Rate limits the requests to the Quatt API, shared by the CICs of an account
+        self.request_scheduler = request_scheduler or QuattRequestScheduler()
+        # Limits the concurrent requests to the Quatt API, shared by all entries
+        self._request_semaphore = request_semaphore
         self._store = store
-        self._id_token: str | None = None
-        self._refresh_token: str | None = None
+        # Tokens of the account, replaced by the tokens shared by all CICs of the
+        # account once the account is known
+        self._auth = QuattAccountAuth(session)
+        self._remove_auth_listener = self._auth.async_add_listener(self._save_tokens)
+        # Firebase installation and remote config, reused until they expire
         self._fid: str | None = None
         self._firebase_auth_token: str | None = None
+        self._firebase_auth_token_expires_at: float | None = None
+        self._remote_config_fetched_at: float | None = None
         self._installation_id: str | None = None
+        self._installation_id_updated_at: float | None = None
         self._pairing_completed: bool = False
-        # Insights cache keyed by request parameters: key -> (expires_at, result_dict)
-        self._insights_cache: dict[
-            tuple[str, str, bool], tuple[datetime, dict[str, Any]]
+        # Last tokens handed to the store, used to skip writes of unchanged tokens
+        self._stored_tokens: dict[str, Any] = {}
+        self._tokens_save_pending = False
+        # Bytes received per endpoint and per day, for diagnostics
+        self.transfer_stats = TransferStats(transfer_store)
+        # Validators and parsed bodies of the polled endpoints
+        self._conditional_cache = ConditionalCache()
+        # Insights cache keyed by request parameters (from_date, timeframe, advanced)
+        self._insights_cache = InsightsCache(insights_store)
+        # Insights of open periods that are updated with the current day only
+        self._insights_increments: dict[tuple[str, str, bool], InsightsIncrement] = {}
+        self._insights_not_incremental: set[tuple[str, str, bool]] = set()
+        # Running insights requests, shared by all callers of the same insights
+        self._insights_tasks: dict[
+            tuple[str, str, bool], asyncio.Task[dict[str, Any] | None]
         ] = {}
 
+    @property
+    def account_id(self) -> str | None:
+        """Return the id of the Quatt account the tokens belong to."""
+        return self._auth.account_id
+
+    @property
+    def _id_token(self) -> str | None:
+        """Return the id token of the account."""
+        return self._auth.id_token
+
+    @_id_token.setter
+    def _id_token(self, value: str | None) -> None:
+        self._auth.id_token = value
+
+    @property
+    def _refresh_token(self) -> str | None:
+        """Return the refresh token of the account."""
+        return self._auth.refresh_token
+
+    @_refresh_token.setter
+    def _refresh_token(self, value: str | None) -> None:
+        self._auth.refresh_token = value
+
+    @property
+    def account_auth(self) -> QuattAccountAuth:
+        """Return the authentication of the account."""
+        return self._auth
+
+    def use_account_auth(self, auth: QuattAccountAuth) -> None:
+        """Share the tokens and their refresh with the other CICs of the account."""
+        if auth is self._auth:
+            return
+
+        auth.merge_tokens(self._id_token, self._refresh_token)
+        self._remove_auth_listener()
+        self._auth = auth
+        self._remove_auth_listener = auth.async_add_listener(self._save_tokens)
+        auth.schedule_refresh()
+        self._save_tokens()
+
+    def _detach_account_auth(self) -> None:
+        """Stop sharing the tokens before they are replaced by a new user.
+
+        A full authentication signs up a new user, its tokens must not replace
+        the tokens of the other CICs of the account.
+        """
+        self._remove_auth_listener()
+        self._auth = QuattAccountAuth(self._session)
+        self._remove_auth_listener = self._auth.async_add_listener(self._save_tokens)
+
+    @asynccontextmanager
+    async def _quatt_request(
+        self, method: str, url: str, priority: RequestPriority, **kwargs: Any
+    ) -> AsyncIterator[aiohttp.ClientResponse]:
+        """Send a request to the Quatt API via the request scheduler.
+
+        A rate limited (429) request holds all requests of the account for the
+        Retry-After delay and is retried once when the delay is short enough.
+        Compressed responses are requested and the received bytes are counted.
+
+        The body is read before the response is handed to the caller, so the
+        fleet request permit is not held while the caller handles the response
+        (e.g. while it retries the request with a refreshed token).
+        """
+        kwargs["headers"] = {
+            "Accept-Encoding": ACCEPT_ENCODING,
+            **kwargs.get("headers", {}),
+        }
+        for attempt in range(2):
+            await self.request_scheduler.async_acquire(priority)
+            async with AsyncExitStack() as stack:
+                # The permit is held while sending and reading, the response
+                # stays open for the caller after the permit is released
+                async with self._request_semaphore or nullcontext():
+                    response = await stack.enter_async_context(
+                        self._session.request(method, url, **kwargs)
+                    )
+                    await response.read()
+
+                if response.status == 429:
+                    delay = parse_retry_after(response.headers.get("Retry-After"))
+                    self.request_scheduler.retry_after(delay)
+                    if attempt == 0 and delay <= REMOTE_RETRY_AFTER_MAX:
+                        _LOGGER.debug("Rate limited, retrying %s in %ss", url, delay)
+                        continue
+
+                self._add_transfer(url, kwargs.get("params"), response)
+                yield response
+                return
+
+    def _add_transfer(
+        self,
+        url: str,
+        params: dict[str, str] | None,
+        response: aiohttp.ClientResponse,
+    ) -> None:
+        """Count the bytes of a response that has been read."""
+        endpoint = url.removeprefix(QUATT_API_BASE_URL).replace(self.cic, "{cic}")
+        if self._installation_id:
+            endpoint = endpoint.replace(self._installation_id, "{installation}")
+        if params:
+            # The start date does not change the size, the other parameters do
+            endpoint += "?" + "&".join(
+                f"{name}={value}"
+                for name, value in sorted(params.items())
+                if name != "from"
+            )
+
+        content = response.content
+        content_length = response.headers.get("Content-Length")
+        transferred_bytes: int | None = None
+        if hasattr(content, "total_compressed_bytes"):
+            # Counted by aiohttp 3.14+, None when the response was not compressed
+            transferred_bytes = content.total_compressed_bytes
+            if transferred_bytes is None:
+                transferred_bytes = content.total_bytes
+        elif content_length and content_length.isdigit():
+            transferred_bytes = int(content_length)
+        elif "Content-Encoding" not in response.headers:
+            transferred_bytes = content.total_bytes
+
+        self.transfer_stats.add(endpoint, transferred_bytes, content.total_bytes)
+
     def load_tokens(
         self,
         id_token: str | None,
         refresh_token: str | None,
         installation_id: str | None,
+        installation_id_updated_at: float | None = None,
+        firebase: dict[str, Any] | None = None,
     ) -> None:
         """Load tokens from storage."""
         self._id_token = id_token
         self._refresh_token = refresh_token
         self._installation_id = installation_id
+        self._installation_id_updated_at = installation_id_updated_at
+        self.load_firebase(firebase)
+        self._stored_tokens = self._tokens()
         if id_token:
             _LOGGER.debug("Tokens loaded from storage")
+        self._auth.schedule_refresh()
+
+    def load_firebase(self, firebase: dict[str, Any] | None) -> None:
+        """Load the stored Firebase installation and remote config state."""
+        firebase = firebase or {}
+        self._fid = firebase.get("fid")
+        self._firebase_auth_token = firebase.get("auth_token")
+        self._firebase_auth_token_expires_at = firebase.get("auth_token_expires_at")
+        self._remote_config_fetched_at = firebase.get("remote_config_fetched_at")
+
+    def _tokens(self) -> dict[str, Any]:
+        """Return the tokens and the authentication state to store."""
+        return {
+            "id_token": self._id_token,
+            "refresh_token": self._refresh_token,
+            "installation_id": self._installation_id,
+            "installation_id_updated_at": self._installation_id_updated_at,
+            "firebase": {
+                "fid": self._fid,
+                "auth_token": self._firebase_auth_token,
+                "auth_token_expires_at": self._firebase_auth_token_expires_at,
+                "remote_config_fetched_at": self._remote_config_fetched_at,
+            },
+        }
 
-    async def _save_tokens(self) -> None:
-        """Save tokens to storage."""
-        if self._store:
-            await self._store.async_save(
-                {
-                    "id_token": self._id_token,
-                    "refresh_token": self._refresh_token,
-                    "installation_id": self._installation_id,
-                }
-            )
+    def cancel_background_tasks(self) -> None:
+        """Stop following the tokens and cancel the running insights requests.
+
+        The token refresh is cancelled when no other CIC of the account uses it.
+        """
+        self._remove_auth_listener()
+
+        for task in list(self._insights_tasks.values()):
+            task.cancel()
+
+    async def _async_ensure_valid_token(self) -> None:
+        """Refresh the id token when it is (about to be) expired."""
+        await self._auth.async_ensure_valid_token()
+
+    def _save_tokens(self) -> None:
+        """Schedule saving the tokens to storage.
+
+        Writes are delayed so consecutive changes result in a single write, tokens
+        equal to the stored tokens are not written at all.
+        """
+        if not self._store:
+            return
+
+        tokens = self._tokens()
+        if tokens == self._stored_tokens:
+            return
+
+        self._stored_tokens = tokens
+        self._tokens_save_pending = True
+        self._store.async_delay_save(self._tokens_to_store, TOKEN_SAVE_DELAY)
+        _LOGGER.debug("Tokens scheduled to be saved to storage")
+
+    def _tokens_to_store(self) -> dict[str, Any]:
+        """Return the tokens for the delayed save."""
+        self._tokens_save_pending = False
+        return self._stored_tokens
+
+    async def async_flush_tokens(self) -> None:
+        """Write pending token changes to storage immediately."""
+        if self._store and self._tokens_save_pending:
+            self._tokens_save_pending = False
+            await self._store.async_save(self._stored_tokens)
             _LOGGER.debug("Tokens saved to storage")
 
+    async def async_load_insights_cache(self) -> None:
+        """Load the persisted insights cache."""
+        await self._insights_cache.async_load()
+
+    async def async_save_insights_cache(self) -> None:
+        """Write the insights cache to storage immediately."""
+        await self._insights_cache.async_save()
+
     async def authenticate(
-        self, first_name: str = "HomeAssistant", last_name: str = "User"
+        self,
+        first_name: str = "HomeAssistant",
+        last_name: str = "User",
+        pairing_progress: Callable[[float], None] | None = None,
     ) -> bool:
-        """Authenticate with Firebase and Quatt API."""
+        """Authenticate with Firebase and Quatt API.
+
+        Args:
+            first_name: First name of the user profile
+            last_name: Last name of the user profile
+            pairing_progress: Called with the elapsed fraction (0-1) of the pairing
+                              timeout while waiting for the button press
+
+        """
         try:
             # Check if we have existing tokens
             if self._id_token and self._refresh_token:
@@ -96,36 +359,32 @@ class QuattRemoteApiClient(QuattApiClient):
 
                 if cic_data:
                     _LOGGER.info("Successfully authenticated with existing tokens")
+                    await self._async_ensure_installation_id()
                     return True
 
                 # Token might be expired, try refresh
                 _LOGGER.debug("Existing token failed, attempting refresh")
                 if await self.refresh_token():
-                    await self._save_tokens()
                     # Verify refreshed token works
                     cic_data = await self.get_cic_data()
                     if cic_data:
                         _LOGGER.info("Successfully authenticated with refreshed token")
+                        await self._async_ensure_installation_id()
                         return True
 
                 # Refresh failed, fall through to full auth
                 _LOGGER.warning("Token refresh failed, performing full authentication")
 
             # Full authentication flow (needed for initial setup or when tokens fail)
-            # Step 1: Get Firebase Installation ID
-            if not await self._get_firebase_installation():
-                return False
+            self._detach_account_auth()
 
-            # Step 2: Fetch Firebase Remote Config
-            if not await self._firebase_fetch():
-                return False
-
-            # Step 3: Sign up new user (anonymous)
-            if not await self._signup_new_user():
-                return False
-
-            # Step 4: Get account information
-            if not await self._get_account_info():
+            # Step 1-4: Get Firebase Installation ID and fetch Firebase Remote Config
+            # (reused while valid), at the same time sign up new user (anonymous)
+            # and get account information
+            bootstrapped, signed_up = await asyncio.gather(
+                self._async_firebase_bootstrap(), self._async_sign_up()
+            )
+            if not bootstrapped or not signed_up:
                 return False
 
             # Step 5: Update user profile
@@ -139,7 +398,7 @@ class QuattRemoteApiClient(QuattApiClient):
                 return False
 
             # Step 7: Wait for user to press button on CIC and verify pairing
-            if not await self._wait_for_pairing():
+            if not await self._wait_for_pairing(pairing_progress):
                 return False
 
             # Step 8: Get installation ID
@@ -147,7 +406,8 @@ class QuattRemoteApiClient(QuattApiClient):
                 return False
 
             # Save tokens after successful authentication
-            await self._save_tokens()
+            self._save_tokens()
+            self._auth.schedule_refresh()
         except aiohttp.ClientError as err:
             _LOGGER.error("Authentication failed - network error: %s", err)
             return False
@@ -161,6 +421,76 @@ class QuattRemoteApiClient(QuattApiClient):
             _LOGGER.info("Successfully authenticated with Quatt API")
             return True
 
+    async def pair_with_account(
+        self,
+        auth: QuattAccountAuth,
+        pairing_progress: Callable[[float], None] | None = None,
+    ) -> bool:
+        """Pair the CIC with the account of an already configured CIC.
+
+        No new user is signed up, so the CICs share the tokens of the account
+        and their refresh.
+        """
+        self.use_account_auth(auth)
+        try:
+            await self._async_ensure_valid_token()
+
+            # Request pairing and wait for the user to press the button on the CIC
+            if not await self._request_pair():
+                return False
+            if not await self._wait_for_pairing(pairing_progress):
+                return False
+
+            # The installation of the CIC is another one of the account
+            if not await self._get_installation_id():
+                return False
+
+            self._save_tokens()
+        except aiohttp.ClientError as err:
+            _LOGGER.error("Pairing failed - network error: %s", err)
+            return False
+        except TimeoutError as err:
+            _LOGGER.error("Pairing failed - timeout: %s", err)
+            return False
+        except json.JSONDecodeError as err:
+            _LOGGER.error("Pairing failed - invalid JSON response: %s", err)
+            return False
+        else:
+            _LOGGER.info("Paired with the Quatt account of the configured CICs")
+            return True
+
+    def _firebase_installation_valid(self) -> bool:
+        """Check if the stored Firebase installation can still be used."""
+        return bool(
+            self._fid
+            and self._firebase_auth_token
+            and self._firebase_auth_token_expires_at
+            and self._firebase_auth_token_expires_at - TOKEN_EXPIRY_LEEWAY > time.time()
+        )
+
+    async def _async_firebase_bootstrap(self) -> bool:
+        """Get the Firebase installation and remote config, unless still valid."""
+        if self._firebase_installation_valid():
+            _LOGGER.debug("Using stored Firebase installation")
+        elif await self._get_firebase_installation():
+            # The remote config belongs to the installation
+            self._remote_config_fetched_at = None
+        else:
+            return False
+
+        if (
+            self._remote_config_fetched_at is not None
+            and self._remote_config_fetched_at + FIREBASE_REMOTE_CONFIG_TTL
+            > time.time()
+        ):
+            _LOGGER.debug("Using stored Firebase remote config")
+            return True
+        return await self._firebase_fetch()
+
+    async def _async_sign_up(self) -> bool:
+        """Sign up a new anonymous user and get its account information."""
+        return await self._signup_new_user() and await self._get_account_info()
+
     async def _get_firebase_installation(self) -> bool:
         """Get Firebase Installation ID and auth token."""
         headers = {
@@ -188,6 +518,13 @@ class QuattRemoteApiClient(QuattApiClient):
                     self._fid = data.get("fid")
                     auth_token = data.get("authToken", {})
                     self._firebase_auth_token = auth_token.get("token")
+                    # Lifetime of the auth token, e.g. "604800s"
+                    try:
+                        self._firebase_auth_token_expires_at = time.time() + float(
+                            str(auth_token.get("expiresIn", "0")).rstrip("s")
+                        )
+                    except ValueError:
+                        self._firebase_auth_token_expires_at = None
                     _LOGGER.debug("Firebase installation successful")
                     return True
                 _LOGGER.error("Firebase installation failed: %s", await response.text())
@@ -242,6 +579,7 @@ class QuattRemoteApiClient(QuattApiClient):
             ) as response:
                 if response.status == 200:
                     _LOGGER.debug("Firebase remote config fetched successfully")
+                    self._remote_config_fetched_at = time.time()
                     return True
                 _LOGGER.error(
                     "Firebase remote config fetch failed: %s", await response.text()
@@ -261,13 +599,7 @@ class QuattRemoteApiClient(QuattApiClient):
 
     def _get_headers(self):
         """Set common headers for Firebase requests."""
-        return {
-            "X-Android-Cert": GOOGLE_ANDROID_CERT,
-            "X-Android-Package": GOOGLE_ANDROID_PACKAGE,
-            "X-Client-Version": GOOGLE_CLIENT_VERSION,
-            "X-Firebase-GMPID": GOOGLE_APP_ID,
-            "X-Firebase-Client": GOOGLE_FIREBASE_CLIENT,
-        }
+        return firebase_headers()
 
     async def _signup_new_user(self) -> bool:
         """Sign up new anonymous user with Firebase."""
@@ -339,8 +671,10 @@ class QuattRemoteApiClient(QuattApiClient):
         url = f"{QUATT_API_BASE_URL}/me"
 
         try:
-            async with self._session.put(
+            async with self._quatt_request(
+                "PUT",
                 url,
+                RequestPriority.INTERACTIVE,
                 json=payload,
                 headers=headers,
             ) as response:
@@ -373,8 +707,10 @@ class QuattRemoteApiClient(QuattApiClient):
         url = f"{QUATT_API_BASE_URL}/me/cic/{self.cic}/requestPair"
 
         try:
-            async with self._session.post(
+            async with self._quatt_request(
+                "POST",
                 url,
+                RequestPriority.INTERACTIVE,
                 json=payload,
                 headers=headers,
             ) as response:
@@ -393,8 +729,15 @@ class QuattRemoteApiClient(QuattApiClient):
             _LOGGER.error("Pairing request error - invalid JSON response: %s", err)
             return False
 
-    async def _wait_for_pairing(self) -> bool:
-        """Wait for user to press button on CIC device and verify pairing."""
+    async def _wait_for_pairing(
+        self, progress: Callable[[float], None] | None = None
+    ) -> bool:
+        """Wait for user to press button on CIC device and verify pairing.
+
+        The profile is checked often at first and less often later on. Waiting
+        stops as soon as the CIC is part of the profile. Cancelling the wait also
+        abandons the running request.
+        """
         if not self._id_token:
             return False
 
@@ -402,28 +745,48 @@ class QuattRemoteApiClient(QuattApiClient):
 
         headers = {"Authorization": f"Bearer {self._id_token}"}
         url = f"{QUATT_API_BASE_URL}/me"
+        cic = self.cic.encode()
 
         # Poll for up to PAIRING_TIMEOUT seconds
-        start_time = asyncio.get_event_loop().time()
-        while (asyncio.get_event_loop().time() - start_time) < PAIRING_TIMEOUT:
-            try:
-                async with self._session.get(url, headers=headers) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        # Check if CIC is in the user's account
-                        result = data.get("result", {})
-                        cic_ids = result.get("cicIds", [])
-
-                        if cic_ids and self.cic in cic_ids:
-                            _LOGGER.info("Pairing completed successfully!")
-                            self._pairing_completed = True
-                            return True
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + PAIRING_TIMEOUT
+        interval = PAIRING_CHECK_INTERVAL
+        while (remaining := deadline - loop.time()) > 0:
+            if progress is not None:
+                progress(1 - remaining / PAIRING_TIMEOUT)
 
-                        _LOGGER.debug("Pairing not yet completed, waiting")
-                    else:
+            # Wait before checking, the button is not pressed immediately
+            await asyncio.sleep(min(interval, remaining))
+            interval = min(interval * PAIRING_CHECK_BACKOFF, PAIRING_CHECK_MAX_INTERVAL)
+
+            try:
+                async with self._quatt_request(
+                    "GET", url, RequestPriority.INTERACTIVE, headers=headers
+                ) as response:
+                    if response.status != 200:
                         _LOGGER.warning(
                             "Failed to check pairing status: %s", await response.text()
                         )
+                        continue
+
+                    # Only decode the profile when it mentions the CIC
+                    body = await response.read()
+                    if cic not in body:
+                        _LOGGER.debug("Pairing not yet completed, waiting")
+                        continue
+
+                    # Check if CIC is in the user's account
+                    result = json.loads(body).get("result", {})
+                    cic_ids = result.get("cicIds", [])
+
+                    if cic_ids and self.cic in cic_ids:
+                        _LOGGER.info("Pairing completed successfully!")
+                        self._pairing_completed = True
+                        if progress is not None:
+                            progress(1)
+                        return True
+
+                    _LOGGER.debug("Pairing not yet completed, waiting")
             except aiohttp.ClientError as err:
                 _LOGGER.warning(
                     "Error checking pairing status - network error: %s", err
@@ -432,14 +795,11 @@ class QuattRemoteApiClient(QuattApiClient):
                 _LOGGER.warning("Error checking pairing status - timeout: %s", err)
             except json.JSONDecodeError as err:
                 _LOGGER.warning("Error checking pairing status - invalid JSON: %s", err)
-            except KeyError as err:
+            except (AttributeError, KeyError) as err:
                 _LOGGER.warning(
                     "Error checking pairing status - missing key in response: %s", err
                 )
 
-            # Wait before checking again
-            await asyncio.sleep(PAIRING_CHECK_INTERVAL)
-
         _LOGGER.error(
             "Pairing timeout - user did not press button within %s seconds",
             PAIRING_TIMEOUT,
@@ -456,52 +816,60 @@ class QuattRemoteApiClient(QuattApiClient):
             _LOGGER.error("No installations found")
             return False
 
-        # Get the first installation (or match by CIC if available)
-        for installation in installations:
-            external_id = installation.get("externalId")
-            if external_id and external_id.startswith("INS-"):
-                self._installation_id = external_id
-                _LOGGER.info("Installation ID: %s", self._installation_id)
-                return True
+        # Use the installation of the CIC, or the first one when none matches
+        candidates = [
+            installation
+            for installation in installations
+            if str(installation.get("externalId", "")).startswith("INS-")
+        ]
+        if not candidates:
+            _LOGGER.error("No valid installation ID found")
+            return False
 
-        _LOGGER.error("No valid installation ID found")
-        return False
+        installation = next(
+            (
+                installation
+                for installation in candidates
+                if _installation_has_cic(installation, self.cic)
+            ),
+            candidates[0],
+        )
+        self._installation_id = installation["externalId"]
+        self._installation_id_updated_at = time.time()
+        _LOGGER.info("Installation ID: %s", self._installation_id)
+        return True
+
+    async def _async_ensure_installation_id(self) -> None:
+        """Look up the installation ID when it was not stored or has expired."""
+        if (
+            self._installation_id
+            and self._installation_id_updated_at is not None
+            and self._installation_id_updated_at + INSTALLATION_ID_TTL > time.time()
+        ):
+            return
+
+        if await self._get_installation_id():
+            self._save_tokens()
+        elif self._installation_id:
+            _LOGGER.debug("Installation ID lookup failed, using the stored one")
+        else:
+            _LOGGER.warning("No installation ID, insights are not available")
 
-    async def refresh_token(self) -> bool:
-        """Refresh the authentication token."""
-        if not self._refresh_token:
-            return False
+    async def refresh_token(self, stale_token: str | None = None) -> bool:
+        """Refresh the authentication token of the account.
 
-        headers = self._get_headers()
-        payload = {
-            "grantType": "refresh_token",
-            "refreshToken": self._refresh_token,
-        }
-        url = f"{FIREBASE_TOKEN_URL}?key={GOOGLE_API_KEY}"
+        Refreshes are serialized, so concurrent callers (also of other CICs of the
+        account) wait for the refresh in progress instead of starting their own.
 
-        try:
-            async with self._session.post(
-                url,
-                json=payload,
-                headers=headers,
-            ) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    self._id_token = data.get("id_token")
-                    self._refresh_token = data.get("refresh_token")
-                    _LOGGER.debug("Token refresh successful")
-                    return True
-                _LOGGER.error("Token refresh failed: %s", await response.text())
-                return False
-        except aiohttp.ClientError as err:
-            _LOGGER.error("Token refresh error - network error: %s", err)
-            return False
-        except TimeoutError as err:
-            _LOGGER.error("Token refresh error - timeout: %s", err)
-            return False
-        except json.JSONDecodeError as err:
-            _LOGGER.error("Token refresh error - invalid JSON response: %s", err)
-            return False
+        Args:
+            stale_token: The id token the caller found to be expired or rejected.
+                         When it has already been replaced no new refresh is done.
+
+        Returns:
+            True if a valid token is available, False otherwise
+
+        """
+        return await self._auth.async_refresh(stale_token)
 
     async def get_installations(self) -> list[dict[str, Any]]:
         """Get list of installations."""
@@ -512,7 +880,9 @@ class QuattRemoteApiClient(QuattApiClient):
         url = f"{QUATT_API_BASE_URL}/me/installations"
 
         try:
-            async with self._session.get(url, headers=headers) as response:
+            async with self._quatt_request(
+                "GET", url, RequestPriority.POLL, headers=headers
+            ) as response:
                 if response.status == 200:
                     data = await response.json()
                     return data.get("result", [])
@@ -533,21 +903,34 @@ class QuattRemoteApiClient(QuattApiClient):
         if not self._id_token:
             return None
 
-        headers = {"Authorization": f"Bearer {self._id_token}"}
+        await self._async_ensure_valid_token()
+        id_token = self._id_token
         url = f"{QUATT_API_BASE_URL}/me/cic/{self.cic}"
+        key = request_key(url)
+        headers = {
+            "Authorization": f"Bearer {id_token}",
+            **self._conditional_cache.headers(key),
+        }
 
         try:
-            async with self._session.get(url, headers=headers) as response:
+            async with self._quatt_request(
+                "GET", url, RequestPriority.POLL, headers=headers
+            ) as response:
+                # Not modified, reuse the previous response
+                if response.status == 304 and (
+                    cached := self._conditional_cache.get(key)
+                ):
+                    return cached.data
+
                 if response.status == 200:
-                    return await response.json()
+                    return await self._conditional_cache.async_decode(key, response)
 
                 # Handle 401 Unauthorized or 403 Forbidden - token might be expired
                 if response.status in (401, 403) and retry_on_403:
                     _LOGGER.debug(
                         "Got %s, attempting to refresh token", response.status
                     )
-                    if await self.refresh_token():
-                        await self._save_tokens()
+                    if await self.refresh_token(stale_token=id_token):
                         # Retry once with new token (prevent infinite loop with retry_on_403=False)
                         return await self.get_cic_data(retry_on_403=False)
                     _LOGGER.error("Token refresh failed after %s", response.status)
@@ -570,25 +953,16 @@ class QuattRemoteApiClient(QuattApiClient):
             return None
 
     async def async_get_data(self, retry_on_client_error: bool = False) -> Any:
-        """Get data from the remote API (compatible with local client interface)."""
-        # Get CIC data from remote API
+        """Get data from the remote API (compatible with local client interface).
+
+        The insights are not part of this data, they are fetched on their own
+        schedule by the insights coordinator.
+        """
         cic_data = await self.get_cic_data()
         if not cic_data:
             return None
 
-        result = cic_data.get("result", {})
-
-        # Fetch insights data and merge it into the result
-        if not self._installation_id:
-            _LOGGER.debug("No installation ID available, skipping insights fetch")
-            return result
-
-        # Get the insights data (with caching)
-        insights_data = await self.get_insights()
-        if insights_data is not None:
-            result["insights"] = insights_data
-
-        return result
+        return cic_data.get("result", {})
 
     async def get_insights(
         self,
@@ -596,15 +970,21 @@ class QuattRemoteApiClient(QuattApiClient):
         timeframe: str = "all",
         advanced_insights: bool = False,
         retry_on_403: bool = True,
+        force_refresh: bool = False,
     ) -> dict[str, Any] | None:
         """Get (cached) insights data from installation.
 
+        Expired insights are returned immediately while they are refreshed in the
+        background. Only insights that are not cached wait for the request.
+        Concurrent callers for the same insights share a single request.
+
         Args:
             from_date: Start date in ISO format (e.g., "2020-01-01"). Defaults to "2020-01-01"
             timeframe: Timeframe for insights ("all", "day", "week", "month", "year"). Defaults to "all".
                       The API automatically calculates the end date based on from_date and timeframe.
             advanced_insights: Whether to include advanced insights. Defaults to False
             retry_on_403: Whether to retry on 403 errors. Defaults to True
+            force_refresh: Whether to wait for a new request even when the insights are cached. Defaults to False
 
         Returns:
             Dictionary with insights data or None if failed
@@ -616,6 +996,152 @@ class QuattRemoteApiClient(QuattApiClient):
             )
             return None
 
+        # Stable cache key for this specific parameter combination
+        key = (from_date, timeframe, advanced_insights)
+        cached = self._insights_cache.get(key)
+
+        if cached and not force_refresh:
+            # Fresh cache hit
+            if cached.fresh:
+                _LOGGER.debug("Using cached insights: %s", key)
+                return cached.result
+
+            # Stale cache hit, serve it and revalidate in the background
+            _LOGGER.debug("Using stale cached insights, refreshing: %s", key)
+            self._insights_fetch_task(key, retry_on_403)
+            return cached.result
+
+        # The request is shared, so a cancelled caller must not cancel it
+        result = await asyncio.shield(self._insights_fetch_task(key, retry_on_403))
+
+        # Request failed: fall back to last cached value (even if expired), if available
+        if result is None and cached is not None:
+            _LOGGER.debug("Insights fetch failed, returning cached value (%s)", key)
+            return cached.result
+
+        return result
+
+    def _insights_fetch_task(
+        self, key: tuple[str, str, bool], retry_on_403: bool
+    ) -> asyncio.Task[dict[str, Any] | None]:
+        """Get the running insights request for the key or start a new one."""
+        task = self._insights_tasks.get(key)
+        if task is None:
+            task = asyncio.get_running_loop().create_task(
+                self._fetch_insights(*key, retry_on_403=retry_on_403)
+            )
+            self._insights_tasks[key] = task
+            task.add_done_callback(lambda _task: self._insights_tasks.pop(key, None))
+        return task
+
+    async def _fetch_insights(
+        self,
+        from_date: str,
+        timeframe: str,
+        advanced_insights: bool,
+        retry_on_403: bool = True,
+    ) -> dict[str, Any] | None:
+        """Request the insights from the API and cache them."""
+        key = (from_date, timeframe, advanced_insights)
+        if self._insights_incremental(key):
+            result = await self._fetch_insights_incremental(key, retry_on_403)
+        else:
+            result = await self._request_insights(*key, retry_on_403=retry_on_403)
+
+        if result is not None:
+            _LOGGER.debug("Fetched and cached insights: %s", key)
+            self._insights_cache.set(key, result)
+        return result
+
+    def _insights_incremental(self, key: tuple[str, str, bool]) -> bool:
+        """Check if the insights can be updated with only the current day."""
+        from_date, timeframe, advanced_insights = key
+        if (
+            advanced_insights
+            or timeframe not in INCREMENTAL_TIMEFRAMES
+            or key in self._insights_not_incremental
+        ):
+            return False
+
+        # Closed periods are cached forever, so only open periods are updated
+        try:
+            start = date.fromisoformat(from_date)
+        except ValueError:
+            return False
+        period_end = insights_period_end(from_date, timeframe)
+        return period_end is not None and start <= dt_util.now().date() < period_end
+
+    async def _fetch_insights_incremental(
+        self, key: tuple[str, str, bool], retry_on_403: bool
+    ) -> dict[str, Any] | None:
+        """Request the insights of an open period with only the current day.
+
+        The insights of the full period are requested together with the current
+        day once a day. After that only the current day is requested and its change
+        is applied to the insights of the full period.
+        """
+        today = dt_util.now().date().isoformat()
+        increment = self._insights_increments.get(key)
+        if increment is not None and increment.day == today:
+            day = await self._async_get_day_insights(today, retry_on_403)
+            if day is None:
+                return None
+
+            merged = merge_day_insights(increment.base, increment.day_base, day)
+            if merged is not None:
+                _LOGGER.debug("Merged insights of %s into: %s", today, key)
+                return merged
+
+        # Full request, the increments of previous days are no longer valid
+        for increment_key, increment in list(self._insights_increments.items()):
+            if increment_key == key or increment.day != today:
+                del self._insights_increments[increment_key]
+
+        # The base of the current day must be as recent as the period, so it is
+        # requested and not taken from the cache
+        base, day_base = await asyncio.gather(
+            self._request_insights(*key, retry_on_403=retry_on_403),
+            asyncio.shield(
+                self._insights_fetch_task((today, "day", False), retry_on_403)
+            ),
+        )
+        if base is None or day_base is None:
+            return base
+
+        if merge_day_insights(base, day_base, day_base) is None:
+            # The current day can not be located in the graph of the period
+            _LOGGER.debug("Insights can not be merged incrementally: %s", key)
+            self._insights_not_incremental.add(key)
+        else:
+            self._insights_increments[key] = InsightsIncrement(today, base, day_base)
+        return base
+
+    async def _async_get_day_insights(
+        self, day: str, retry_on_403: bool
+    ) -> dict[str, Any] | None:
+        """Get the insights of the day to update the insights of an open period.
+
+        The insights of the day are shared with the requests of the other open
+        periods and with the callers of the day insights.
+        """
+        key = (day, "day", False)
+        if (cached := self._insights_cache.get(key)) is not None and cached.fresh:
+            return cached.result
+
+        # The request is shared, so a cancelled caller must not cancel it
+        return await asyncio.shield(self._insights_fetch_task(key, retry_on_403))
+
+    async def _request_insights(
+        self,
+        from_date: str,
+        timeframe: str,
+        advanced_insights: bool,
+        retry_on_403: bool = True,
+    ) -> dict[str, Any] | None:
+        """Request the insights from the API."""
+        if not self._id_token or not self._installation_id:
+            return None
+
         # Build query parameters
         params = {
             "from": from_date,
@@ -623,42 +1149,28 @@ class QuattRemoteApiClient(QuattApiClient):
             "advancedInsights": str(advanced_insights).lower(),
         }
 
-        # Stable cache key for this specific parameter combination
-        key = (from_date, timeframe, advanced_insights)
-        cached = self._insights_cache.get(key)
-
-        # Fresh cache hit
-        now = datetime.now(timezone.utc)  # noqa: UP017
-        if cached and cached[0] > now:
-            _LOGGER.debug("Using cached insights: %s", key)
-            return cached[1]
-
+        await self._async_ensure_valid_token()
+        id_token = self._id_token
         url = f"{QUATT_API_BASE_URL}/me/installation/{self._installation_id}/insights"
-        headers = {"Authorization": f"Bearer {self._id_token}"}
+        key = request_key(url, params)
+        headers = {
+            "Authorization": f"Bearer {id_token}",
+            **self._conditional_cache.headers(key),
+        }
 
         try:
-            async with self._session.get(
-                url, headers=headers, params=params
+            async with self._quatt_request(
+                "GET", url, RequestPriority.INSIGHTS, headers=headers, params=params
             ) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    result = data.get("result", {})
-                    fetched_at = datetime.now(timezone.utc)  # noqa: UP017
-                    expires_at = fetched_at + timedelta(
-                        minutes=INSIGHTS_REMOTE_SCAN_INTERVAL
-                    )
-                    _LOGGER.debug("Fetched and cached insights: %s", key)
-                    self._insights_cache[key] = (expires_at, result)
+                # Not modified, reuse the previous response
+                if response.status == 304 and (
+                    cached := self._conditional_cache.get(key)
+                ):
+                    return cached.data.get("result", {})
 
-                    # Cleanup expired cache entries (keeps memory bounded over time)
-                    for cache_key, (expires_at, _cached_result) in list(
-                        self._insights_cache.items()
-                    ):
-                        if expires_at <= fetched_at:
-                            _LOGGER.debug("Removing cached insights: %s", cache_key)
-                            self._insights_cache.pop(cache_key, None)
-
-                    return result
+                if response.status == 200:
+                    data = await self._conditional_cache.async_decode(key, response)
+                    return data.get("result", {})
 
                 # Handle 401 Unauthorized or 403 Forbidden - token might be expired
                 if response.status in (401, 403) and retry_on_403:
@@ -666,29 +1178,15 @@ class QuattRemoteApiClient(QuattApiClient):
                         "Got %s while getting insights, attempting to refresh token",
                         response.status,
                     )
-                    if await self.refresh_token():
-                        await self._save_tokens()
+                    if await self.refresh_token(stale_token=id_token):
                         # Retry once with new token (avoid infinite loop)
-                        retry = await self.get_insights(
-                            from_date=from_date,
-                            timeframe=timeframe,
-                            advanced_insights=advanced_insights,
+                        return await self._request_insights(
+                            from_date,
+                            timeframe,
+                            advanced_insights,
                             retry_on_403=False,
                         )
 
-                        # If retry succeeded, return it
-                        if retry is not None:
-                            return retry
-
-                        # Retry failed: fall back to last cached value (even if expired), if available
-                        if cached is not None:
-                            _LOGGER.debug(
-                                "Insights retry failed, returning cached value (%s)",
-                                key,
-                            )
-                            return cached[1]
-                        return None
-
                     _LOGGER.warning("Token refresh failed while getting insights")
 
                 _LOGGER.warning(
@@ -696,23 +1194,9 @@ class QuattRemoteApiClient(QuattApiClient):
                     response.status,
                     await response.text(),
                 )
-
-                # Backend failed: fall back to last cached value (even if expired), if available
-                if cached is not None:
-                    _LOGGER.debug(
-                        "Insights fetch failed, returning cached value (%s)", key
-                    )
-                    return cached[1]
-
                 return None
         except (aiohttp.ClientError, TimeoutError, json.JSONDecodeError) as err:
             _LOGGER.warning("Get insights error: %s", err)
-
-            # Transport/parse error: fall back to last cached value (even if expired), if available
-            if cached is not None:
-                _LOGGER.debug("Insights error, returning cached value (%s)", key)
-                return cached[1]
-
             return None
 
     async def update_cic_settings(self, settings: dict[str, Any]) -> bool:
@@ -729,12 +1213,16 @@ class QuattRemoteApiClient(QuattApiClient):
             _LOGGER.error("Cannot update CIC settings: not authenticated")
             return False
 
-        headers = {"Authorization": f"Bearer {self._id_token}"}
+        await self._async_ensure_valid_token()
+        id_token = self._id_token
+        headers = {"Authorization": f"Bearer {id_token}"}
         url = f"{QUATT_API_BASE_URL}/me/cic/{self.cic}"
 
         try:
-            async with self._session.put(
+            async with self._quatt_request(
+                "PUT",
                 url,
+                RequestPriority.INTERACTIVE,
                 json=settings,
                 headers=headers,
             ) as response:
@@ -748,12 +1236,13 @@ class QuattRemoteApiClient(QuattApiClient):
                         "Got %s while updating CIC settings, attempting to refresh token",
                         response.status,
                     )
-                    if await self.refresh_token():
-                        await self._save_tokens()
+                    if await self.refresh_token(stale_token=id_token):
                         # Retry once with new token
                         headers = {"Authorization": f"Bearer {self._id_token}"}
-                        async with self._session.put(
+                        async with self._quatt_request(
+                            "PUT",
                             url,
+                            RequestPriority.INTERACTIVE,
                             json=settings,
                             headers=headers,
                         ) as retry_response:
@@ -0,0 +1,250 @@
+"""Authentication tokens shared by the CICs of a Quatt account."""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+from collections.abc import Callable
+import json
+import logging
+import time
+from typing import Any
+
+import aiohttp
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+
+from .const import (
+    DOMAIN,
+    FIREBASE_TOKEN_URL,
+    GOOGLE_ANDROID_CERT,
+    GOOGLE_ANDROID_PACKAGE,
+    GOOGLE_API_KEY,
+    GOOGLE_APP_ID,
+    GOOGLE_CLIENT_VERSION,
+    GOOGLE_FIREBASE_CLIENT,
+)
+
+TOKEN_REFRESH_MARGIN = 300  # Seconds before expiry to refresh the token
+TOKEN_EXPIRY_LEEWAY = 30  # Seconds before expiry a token is considered expired
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def firebase_headers() -> dict[str, str]:
+    """Get the common headers for Firebase requests."""
+    return {
+        "X-Android-Cert": GOOGLE_ANDROID_CERT,
+        "X-Android-Package": GOOGLE_ANDROID_PACKAGE,
+        "X-Client-Version": GOOGLE_CLIENT_VERSION,
+        "X-Firebase-GMPID": GOOGLE_APP_ID,
+        "X-Firebase-Client": GOOGLE_FIREBASE_CLIENT,
+    }
+
+
+def token_claims(token: str | None) -> dict[str, Any]:
+    """Get the claims from the payload of a JWT token."""
+    if not token:
+        return {}
+
+    try:
+        payload = token.split(".")[1]
+        claims = json.loads(
+            base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4))
+        )
+    except (IndexError, TypeError, ValueError) as err:
+        _LOGGER.debug("Unable to decode token: %s", err)
+        return {}
+    return claims if isinstance(claims, dict) else {}
+
+
+def token_expiry(token: str | None) -> float | None:
+    """Get the expiry (epoch seconds) from the payload of a JWT token."""
+    try:
+        return float(token_claims(token)["exp"])
+    except (KeyError, TypeError, ValueError) as err:
+        if token:
+            _LOGGER.debug("Unable to determine token expiry: %s", err)
+        return None
+
+
+class QuattAccountAuth:
+    """Tokens of a Quatt account and their refresh schedule.
+
+    The clients of all CICs of the account use the same tokens, so the tokens
+    are refreshed once per account. Refreshes are serialized and the listeners
+    (the clients) are notified of every change, e.g. to store the tokens.
+    """
+
+    def __init__(self, session: aiohttp.ClientSession) -> None:
+        """Initialize."""
+        self._session = session
+        self.id_token: str | None = None
+        self.refresh_token: str | None = None
+        self._listeners: list[Callable[[], None]] = []
+        # Token refreshes are serialized, the timer refreshes ahead of the expiry
+        self._refresh_lock = asyncio.Lock()
+        self._refresh_timer: asyncio.TimerHandle | None = None
+        self._refresh_task: asyncio.Task[bool] | None = None
+
+    @property
+    def token_valid(self) -> bool:
+        """Return whether the id token is valid and not (about to be) expired."""
+        expires_at = token_expiry(self.id_token)
+        return expires_at is not None and expires_at - TOKEN_EXPIRY_LEEWAY > time.time()
+
+    @property
+    def account_id(self) -> str | None:
+        """Return the id of the account the tokens belong to."""
+        claims = token_claims(self.id_token)
+        return claims.get("user_id") or claims.get("sub")
+
+    def merge_tokens(self, id_token: str | None, refresh_token: str | None) -> None:
+        """Use the given tokens when they are valid longer than the current ones."""
+        if not id_token or not refresh_token:
+            return
+
+        if self.id_token and (token_expiry(self.id_token) or 0) >= (
+            token_expiry(id_token) or 0
+        ):
+            return
+
+        self.id_token = id_token
+        self.refresh_token = refresh_token
+        self._notify_listeners()
+
+    @callback
+    def async_add_listener(self, listener: Callable[[], None]) -> CALLBACK_TYPE:
+        """Listen for token changes, the refresh stops when no listener is left."""
+        self._listeners.append(listener)
+
+        @callback
+        def remove_listener() -> None:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+            if not self._listeners:
+                self.cancel_refresh()
+
+        return remove_listener
+
+    def _notify_listeners(self) -> None:
+        """Notify the listeners of changed tokens."""
+        for listener in list(self._listeners):
+            listener()
+
+    def schedule_refresh(self) -> None:
+        """Schedule a token refresh shortly before the id token expires."""
+        if self._refresh_timer is not None:
+            self._refresh_timer.cancel()
+            self._refresh_timer = None
+
+        expires_at = token_expiry(self.id_token)
+        if expires_at is None or not self.refresh_token:
+            return
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+
+        delay = max(expires_at - TOKEN_REFRESH_MARGIN - time.time(), 0)
+        _LOGGER.debug("Token refresh scheduled in %d seconds", delay)
+        self._refresh_timer = loop.call_later(delay, self._handle_refresh_timer)
+
+    def _handle_refresh_timer(self) -> None:
+        """Start the scheduled token refresh."""
+        self._refresh_timer = None
+        self._refresh_task = asyncio.get_running_loop().create_task(
+            self.async_refresh(stale_token=self.id_token)
+        )
+
+    def cancel_refresh(self) -> None:
+        """Cancel the scheduled and running token refresh."""
+        if self._refresh_timer is not None:
+            self._refresh_timer.cancel()
+            self._refresh_timer = None
+        if self._refresh_task is not None and not self._refresh_task.done():
+            self._refresh_task.cancel()
+        self._refresh_task = None
+
+    async def async_ensure_valid_token(self) -> None:
+        """Refresh the id token when it is (about to be) expired."""
+        expires_at = token_expiry(self.id_token)
+        if expires_at is not None and expires_at - TOKEN_EXPIRY_LEEWAY <= time.time():
+            _LOGGER.debug("Token expired, refreshing before the request")
+            await self.async_refresh(stale_token=self.id_token)
+
+    async def async_refresh(self, stale_token: str | None = None) -> bool:
+        """Refresh the authentication token.
+
+        Refreshes are serialized, so concurrent callers wait for the refresh in
+        progress instead of starting their own.
+
+        Args:
+            stale_token: The id token the caller found to be expired or rejected.
+                         When it has already been replaced no new refresh is done.
+
+        Returns:
+            True if a valid token is available, False otherwise
+
+        """
+        async with self._refresh_lock:
+            if stale_token is not None and self.id_token != stale_token:
+                _LOGGER.debug("Token already refreshed")
+                return True
+
+            if not await self._request_token_refresh():
+                return False
+
+            self._notify_listeners()
+
+        self.schedule_refresh()
+        return True
+
+    async def _request_token_refresh(self) -> bool:
+        """Request a new id token with the refresh token."""
+        if not self.refresh_token:
+            return False
+
+        headers = firebase_headers()
+        payload = {
+            "grantType": "refresh_token",
+            "refreshToken": self.refresh_token,
+        }
+        url = f"{FIREBASE_TOKEN_URL}?key={GOOGLE_API_KEY}"
+
+        try:
+            async with self._session.post(
+                url,
+                json=payload,
+                headers=headers,
+            ) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    self.id_token = data.get("id_token")
+                    self.refresh_token = data.get("refresh_token")
+                    _LOGGER.debug("Token refresh successful")
+                    return True
+                _LOGGER.error("Token refresh failed: %s", await response.text())
+                return False
+        except aiohttp.ClientError as err:
+            _LOGGER.error("Token refresh error - network error: %s", err)
+            return False
+        except TimeoutError as err:
+            _LOGGER.error("Token refresh error - timeout: %s", err)
+            return False
+        except json.JSONDecodeError as err:
+            _LOGGER.error("Token refresh error - invalid JSON response: %s", err)
+            return False
+
+
+def get_account_auth(
+    hass: HomeAssistant, account_id: str, session: aiohttp.ClientSession
+) -> QuattAccountAuth:
+    """Get the authentication shared by all CICs of the account."""
+    accounts: dict[str, QuattAccountAuth] = hass.data.setdefault(
+        f"_{DOMAIN}_accounts", {}
+    )
+    if account_id not in accounts:
+        accounts[account_id] = QuattAccountAuth(session)
+    return accounts[account_id]
@@ -0,0 +1,258 @@
+"""Vectorized evaluation of the computed local metrics over archived snapshots.
+
+The local coordinator evaluates the computed* methods for a single data.json
+snapshot. For backtesting (e.g. a change of the conversion factors or a new
+CIC firmware) the same metrics can be recomputed over an archive of snapshots
+in one NumPy pass with the functions in this module.
+
+All columns are float64 arrays with one row per snapshot. A value of None in
+the coordinator is represented as NaN, boolean results as 0.0/1.0.
+
+This module is not used by the integration at runtime. NumPy is available in
+every Home Assistant installation but is not a requirement of the integration.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+from typing import Any
+
+import numpy as np
+
+from .const import SupervisoryControlMode
+from .water_properties import CONVERSION_FACTOR_TABLE
+
+# Keys that are extracted from each snapshot (dot notation, like get_value)
+SNAPSHOT_KEYS = (
+    "qc.supervisoryControlMode",
+    "qc.flowRateFiltered",
+    "hp1.temperatureWaterIn",
+    "hp1.temperatureWaterOut",
+    "hp1.power",
+    "hp1.powerInput",
+    "hp2.temperatureWaterIn",
+    "hp2.temperatureWaterOut",
+    "hp2.power",
+    "hp2.powerInput",
+    "flowMeter.waterSupplyTemperature",
+    "boiler.otFbChModeActive",
+    "boiler.otTbCH",
+    "boiler.oTtbTurnOnOffBoilerOn",
+)
+
+_HEATPUMP_HEATING_MODES = (
+    SupervisoryControlMode.HEATING_HEATPUMP_ONLY,
+    SupervisoryControlMode.HEATING_HEATPUMP_PLUS_BOILER,
+)
+
+
+def _lookup(snapshot: dict[str, Any], value_path: str) -> Any:
+    """Retrieve a value by dot notation from a single snapshot."""
+    current_node: Any = snapshot
+    for part in value_path.split("."):
+        if not isinstance(current_node, dict) or part not in current_node:
+            return None
+        current_node = current_node[part]
+    return current_node
+
+
+def snapshots_to_columns(
+    snapshots: Iterable[dict[str, Any]],
+) -> dict[str, np.ndarray]:
+    """Convert data.json snapshots into float64 column arrays.
+
+    Missing and non-numeric values become NaN. The presence of the hp2 device is
+    kept in the additional "hp2" column (1.0 when present).
+    """
+    rows = list(snapshots)
+    columns: dict[str, np.ndarray] = {}
+    for key in SNAPSHOT_KEYS:
+        column = np.full(len(rows), np.nan)
+        for index, snapshot in enumerate(rows):
+            value = _lookup(snapshot, key)
+            if value is None:
+                continue
+            try:
+                column[index] = float(value)
+            except (TypeError, ValueError):
+                continue
+        columns[key] = column
+
+    columns["hp2"] = np.array(
+        [_lookup(snapshot, "hp2") is not None for snapshot in rows], dtype=float
+    )
+    return columns
+
+
+def _round(values: np.ndarray, digits: int = 2) -> np.ndarray:
+    """Round to 2 decimals exactly like round() in the coordinator does.
+
+    NumPy rounds the scaled value, which differs from round() for values close
+    to half-way between two decimals. Those few values are rounded with round().
+    """
+    rounded = np.round(values, digits)
+    scaled = values * 10.0**digits
+    with np.errstate(invalid="ignore"):
+        half_way = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    if half_way.any():
+        rounded[half_way] = [
+            round(value, digits) for value in values[half_way].tolist()
+        ]
+    return rounded
+
+
+def _water_delta(columns: dict[str, np.ndarray], prefix: str) -> np.ndarray:
+    """Compute the water delta of a single heatpump."""
+    return _round(
+        columns[f"{prefix}.temperatureWaterOut"]
+        - columns[f"{prefix}.temperatureWaterIn"]
+    )
+
+
+def _heatpump_heating(mode: np.ndarray) -> np.ndarray:
+    """Return a boolean mask of samples in a heatpump heating mode."""
+    return np.isin(mode, _HEATPUMP_HEATING_MODES)
+
+
+def computed_heat_power(columns: dict[str, np.ndarray]) -> np.ndarray:
+    """Vectorized equivalent of computedHeatPower."""
+    mode = columns["qc.supervisoryControlMode"]
+    duo = columns["hp2"] == 1.0
+
+    temperature_water_out = np.where(
+        duo, columns["hp2.temperatureWaterOut"], columns["hp1.temperatureWaterOut"]
+    )
+    water_delta = _round(temperature_water_out - columns["hp1.temperatureWaterIn"])
+    water_delta = np.where(duo, water_delta, _water_delta(columns, "hp1"))
+
+    value = _round(
+        water_delta
+        * columns["qc.flowRateFiltered"]
+        * CONVERSION_FACTOR_TABLE.conversion_factors(temperature_water_out)
+    )
+    value = np.maximum(value, 0.0)
+
+    return np.where(
+        np.isnan(mode), np.nan, np.where(_heatpump_heating(mode), value, 0.0)
+    )
+
+
+def computed_boiler_heat_power(columns: dict[str, np.ndarray]) -> np.ndarray:
+    """Vectorized equivalent of computedBoilerHeatPower."""
+    opentherm = ~np.isnan(columns["boiler.otFbChModeActive"])
+    boiler_active = np.where(
+        opentherm, columns["boiler.otTbCH"], columns["boiler.oTtbTurnOnOffBoilerOn"]
+    )
+    heatpump_water_out = np.where(
+        columns["hp2"] == 1.0,
+        columns["hp2.temperatureWaterOut"],
+        columns["hp1.temperatureWaterOut"],
+    )
+    flow_water_temperature = columns["flowMeter.waterSupplyTemperature"]
+
+    value = _round(
+        (flow_water_temperature - heatpump_water_out)
+        * columns["qc.flowRateFiltered"]
+        * CONVERSION_FACTOR_TABLE.conversion_factors(flow_water_temperature)
+    )
+    value = np.maximum(value, 0.0)
+
+    return np.where(
+        np.isnan(boiler_active), np.nan, np.where(boiler_active != 0, value, 0.0)
+    )
+
+
+def computed_power_input(columns: dict[str, np.ndarray]) -> np.ndarray:
+    """Vectorized equivalent of computedPowerInput."""
+    power_input_hp_2 = np.where(
+        columns["hp2"] == 1.0, np.nan_to_num(columns["hp2.powerInput"]), 0.0
+    )
+    return np.nan_to_num(columns["hp1.powerInput"]) + power_input_hp_2
+
+
+def computed_power(columns: dict[str, np.ndarray]) -> np.ndarray:
+    """Vectorized equivalent of computedPower."""
+    power_hp_2 = np.where(
+        columns["hp2"] == 1.0, np.nan_to_num(columns["hp2.power"]), 0.0
+    )
+    return np.nan_to_num(columns["hp1.power"]) + power_hp_2
+
+
+def _cop(power_output: np.ndarray, power_input: np.ndarray) -> np.ndarray:
+    """Divide output by input, a zero or missing input results in NaN."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        value = _round(power_output / power_input)
+    value = np.where(power_input == 0, np.nan, value)
+    # Prevent negative sign for 0 values (like: -0.0)
+    return np.where(value == 0, 0.0, value)
+
+
+def computed_cop(
+    columns: dict[str, np.ndarray], electrical_power: np.ndarray
+) -> np.ndarray:
+    """Vectorized equivalent of computedCop.
+
+    The electrical power comes from an external power sensor, so it has to be
+    provided aligned with the snapshots.
+    """
+    return _cop(computed_heat_power(columns), np.asarray(electrical_power, float))
+
+
+def computed_quatt_cop(
+    columns: dict[str, np.ndarray], parent_key: str | None = None
+) -> np.ndarray:
+    """Vectorized equivalent of computedQuattCop."""
+    if parent_key is None:
+        return _cop(computed_power(columns), computed_power_input(columns))
+    return _cop(columns[f"{parent_key}.power"], columns[f"{parent_key}.powerInput"])
+
+
+def computed_defrost(columns: dict[str, np.ndarray], parent_key: str) -> np.ndarray:
+    """Vectorized equivalent of computedDefrost."""
+    mode = columns["qc.supervisoryControlMode"]
+    power_output = columns[f"{parent_key}.power"]
+    water_delta = _water_delta(columns, parent_key)
+
+    defrost = _heatpump_heating(mode) & (power_output < -1) & (water_delta < -1)
+    missing = np.isnan(mode) | np.isnan(power_output) | np.isnan(water_delta)
+    return np.where(missing, np.nan, defrost.astype(float))
+
+
+def compute_metrics(
+    snapshots: Iterable[dict[str, Any]] | dict[str, np.ndarray],
+    electrical_power: Sequence[float | None] | np.ndarray | None = None,
+) -> dict[str, np.ndarray]:
+    """Compute all computed metrics for an archive of snapshots in one pass.
+
+    Args: snapshots: The data.json snapshots or the columns from snapshots_to_columns
+          electrical_power: Optional power sensor values aligned with the snapshots
+
+    Returns: Column arrays keyed by the same keys as the sensor entities
+    """
+    columns = (
+        snapshots if isinstance(snapshots, dict) else snapshots_to_columns(snapshots)
+    )
+
+    metrics = {
+        "computedHeatPower": computed_heat_power(columns),
+        "boiler.computedBoilerHeatPower": computed_boiler_heat_power(columns),
+        "computedPowerInput": computed_power_input(columns),
+        "computedPower": computed_power(columns),
+        "computedQuattCop": computed_quatt_cop(columns),
+    }
+    for parent_key in ("hp1", "hp2"):
+        metrics[f"{parent_key}.computedQuattCop"] = computed_quatt_cop(
+            columns, parent_key
+        )
+        metrics[f"{parent_key}.computedDefrost"] = computed_defrost(columns, parent_key)
+
+    if electrical_power is not None:
+        metrics["computedCop"] = computed_cop(
+            columns,
+            np.array(
+                [np.nan if value is None else value for value in electrical_power],
+                dtype=float,
+            ),
+        )
+
+    return metrics
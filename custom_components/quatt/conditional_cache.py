@@ -0,0 +1,92 @@
+"""Validators and parsed bodies of responses for conditional requests."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+import hashlib
+import json
+import logging
+from typing import Any, NamedTuple
+
+import aiohttp
+
+from .const import CONDITIONAL_CACHE_SIZE
+
+_LOGGER = logging.getLogger(__name__)
+
+RequestKey = tuple[str, tuple[tuple[str, str], ...]]
+
+
+def request_key(url: str, params: dict[str, str] | None = None) -> RequestKey:
+    """Get the cache key of a request from its URL and parameters."""
+    return url, tuple(sorted((params or {}).items()))
+
+
+class CachedResponse(NamedTuple):
+    """Validators, body digest and parsed body of a response."""
+
+    etag: str | None
+    last_modified: str | None
+    digest: bytes
+    data: Any
+
+
+class ConditionalCache:
+    """Size bounded LRU cache of responses for conditional requests.
+
+    Requests are sent with the ETag and Last-Modified validators of the cached
+    response, a 304 response reuses the cached parsed body. When the server
+    does not support validators, a body that is equal to the cached body (by
+    digest) is not decoded again and results in the same parsed object.
+    """
+
+    def __init__(self, max_entries: int = CONDITIONAL_CACHE_SIZE) -> None:
+        """Initialize the cache."""
+        self._max_entries = max_entries
+        self._entries: OrderedDict[RequestKey, CachedResponse] = OrderedDict()
+
+    def get(self, key: RequestKey) -> CachedResponse | None:
+        """Get the cached response."""
+        cached = self._entries.get(key)
+        if cached is not None:
+            self._entries.move_to_end(key)
+        return cached
+
+    def headers(self, key: RequestKey) -> dict[str, str]:
+        """Get the conditional request headers for the cached response."""
+        if (cached := self._entries.get(key)) is None:
+            return {}
+
+        headers = {}
+        if cached.etag:
+            headers["If-None-Match"] = cached.etag
+        if cached.last_modified:
+            headers["If-Modified-Since"] = cached.last_modified
+        return headers
+
+    async def async_decode(
+        self, key: RequestKey, response: aiohttp.ClientResponse
+    ) -> Any:
+        """Decode the JSON body of a response and cache it.
+
+        Raises: json.JSONDecodeError when the body is not valid JSON
+        """
+        body = await response.read()
+        digest = hashlib.sha256(body).digest()
+        cached = self._entries.get(key)
+        if cached is not None and cached.digest == digest:
+            _LOGGER.debug("Response unchanged: %s", key[0])
+            data = cached.data
+        else:
+            data = json.loads(body)
+
+        self._entries[key] = CachedResponse(
+            response.headers.get("ETag"),
+            response.headers.get("Last-Modified"),
+            digest,
+            data,
+        )
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+        return data
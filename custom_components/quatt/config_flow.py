@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import ipaddress
 
 import voluptuous as vol
@@ -35,13 +36,18 @@ from .api import (
 )
 from .api_local import QuattLocalApiClient
 from .api_remote import QuattRemoteApiClient
+from .auth import QuattAccountAuth
 from .const import (
+    CONF_ENERGY_MAX_INTERVAL,
     CONF_LOCAL_CIC,
     CONF_POWER_SENSOR,
     CONF_REMOTE_CIC,
     DEFAULT_LOCAL_SCAN_INTERVAL,
+    DEFAULT_ENERGY_MAX_INTERVAL,
     DEFAULT_REMOTE_SCAN_INTERVAL,
     DOMAIN,
+    ENERGY_MAX_MAX_INTERVAL,
+    ENERGY_MIN_MAX_INTERVAL,
     LOCAL_MAX_SCAN_INTERVAL,
     LOCAL_MIN_SCAN_INTERVAL,
     LOGGER,
@@ -78,52 +84,131 @@ async def _async_register_static_resources(hass: HomeAssistant) -> None:
     hass.data[f"_{DOMAIN}_static_registered"] = True
 
 
+async def _async_find_account_auth(hass: HomeAssistant) -> QuattAccountAuth | None:
+    """Find the Quatt account of a configured CIC with valid tokens."""
+    for coordinators in hass.data.get(DOMAIN, {}).values():
+        if not (remote_coordinator := coordinators.get("remote")):
+            continue
+
+        account_auth = remote_coordinator.client.account_auth
+        await account_auth.async_ensure_valid_token()
+        if account_auth.token_valid:
+            return account_auth
+    return None
+
+
+async def _async_pair(
+    flow, config_update: bool, first_name: str, last_name: str
+) -> bool:
+    """Pair with the CIC, runs as progress task of the pairing step."""
+    session = async_create_clientsession(flow.hass)
+
+    # Use the HA-assigned unique_id as stable store key.
+    # - Config flow: flow.unique_id
+    # - Options flow: flow.config_entry.unique_id
+    store_key = flow.config_entry.unique_id if config_update else flow.unique_id
+    store = Store(flow.hass, STORAGE_VERSION, f"{STORAGE_KEY}_{store_key}")
+    api = QuattRemoteApiClient(flow.cic_name, session, store=store)
+
+    # Reuse the Firebase installation of a previous pairing, the tokens are not
+    # reused so the CIC is paired again
+    if stored_data := await store.async_load():
+        api.load_firebase(stored_data.get("firebase"))
+
+    try:
+        if (account_auth := await _async_find_account_auth(flow.hass)) is not None:
+            # Pair with the account of the configured CICs, so they share it
+            authenticated = await api.pair_with_account(
+                account_auth, pairing_progress=flow.async_update_progress
+            )
+        else:
+            authenticated = await api.authenticate(
+                first_name=first_name,
+                last_name=last_name,
+                pairing_progress=flow.async_update_progress,
+            )
+    finally:
+        # The entry sets up its own client from the stored tokens
+        api.cancel_background_tasks()
+
+    await api.async_flush_tokens()
+    return authenticated
+
+
 async def _async_step_pair_common(
     flow,
     config_update: bool,
     user_input: dict | None = None,
 ) -> ConfigFlowResult:
-    """Handle pairing step in config and options flow."""
+    """Handle pairing step in config and options flow.
+
+    Pairing runs as progress task, so the user sees the remaining time and can
+    cancel the flow while waiting for the button press.
+    """
     # Ensure static resources are registered for use in the form
     await _async_register_static_resources(flow.hass)
 
-    _errors = {}
-    if user_input is not None:
+    if user_input is not None and flow.pair_task is None:
         # User confirmed they are ready to pair
-        session = async_create_clientsession(flow.hass)
+        flow.pair_input = user_input
+        flow.pair_task = flow.hass.async_create_task(
+            _async_pair(
+                flow,
+                config_update,
+                user_input[CONF_FIRST_NAME],
+                user_input[CONF_LAST_NAME],
+            )
+        )
 
-        # Use the HA-assigned unique_id as stable store key.
-        # - Config flow: flow.unique_id
-        # - Options flow: flow.config_entry.unique_id
-        store_key = flow.config_entry.unique_id if config_update else flow.unique_id
-        store = Store(flow.hass, STORAGE_VERSION, f"{STORAGE_KEY}_{store_key}")
-        api = QuattRemoteApiClient(flow.cic_name, session, store=store)
+    if flow.pair_task is not None:
+        if not flow.pair_task.done():
+            return flow.async_show_progress(
+                step_id="pair",
+                progress_action="wait_for_pairing",
+                progress_task=flow.pair_task,
+                description_placeholders={"cic": flow.cic_name},
+            )
+        return flow.async_show_progress_done(next_step_id="pair_finish")
 
-        first_name = user_input[CONF_FIRST_NAME]
-        last_name = user_input[CONF_LAST_NAME]
+    return await _async_show_pair_form(flow)
 
-        if not await api.authenticate(first_name=first_name, last_name=last_name):
-            _errors["base"] = "pairing_timeout"
-        else:
-            if not config_update:
-                # Pairing successful, create entry with both local and remote
-                return flow.async_create_entry(
-                    title=flow.cic_name,
-                    data={
-                        CONF_LOCAL_CIC: flow.ip_address,
-                        CONF_REMOTE_CIC: flow.cic_name,
-                    },
-                )
 
-            # Pairing successful, update config entry
-            new_data = {**flow.config_entry.data, CONF_REMOTE_CIC: flow.cic_name}
-            flow.hass.config_entries.async_update_entry(
-                flow.config_entry, data=new_data
-            )
-            # Reload the integration to apply changes
-            await flow.hass.config_entries.async_reload(flow.config_entry.entry_id)
-            return flow.async_create_entry(title="", data={})
+async def _async_step_pair_finish_common(flow, config_update: bool) -> ConfigFlowResult:
+    """Handle the result of the pairing in config and options flow."""
+    task, flow.pair_task = flow.pair_task, None
+    if task is not None and not task.cancelled() and (exception := task.exception()):
+        LOGGER.error("Unexpected error while pairing", exc_info=exception)
+        return await _async_show_pair_form(flow, flow.pair_input, {"base": "unknown"})
+
+    if task is None or task.cancelled() or not task.result():
+        return await _async_show_pair_form(
+            flow, flow.pair_input, {"base": "pairing_timeout"}
+        )
+
+    if not config_update:
+        # Pairing successful, create entry with both local and remote
+        return flow.async_create_entry(
+            title=flow.cic_name,
+            data={
+                CONF_LOCAL_CIC: flow.ip_address,
+                CONF_REMOTE_CIC: flow.cic_name,
+            },
+        )
 
+    # Pairing successful, update config entry
+    new_data = {**flow.config_entry.data, CONF_REMOTE_CIC: flow.cic_name}
+    flow.hass.config_entries.async_update_entry(flow.config_entry, data=new_data)
+    # Reload the integration to apply changes
+    await flow.hass.config_entries.async_reload(flow.config_entry.entry_id)
+    return flow.async_create_entry(title="", data={})
+
+
+async def _async_show_pair_form(
+    flow,
+    user_input: dict | None = None,
+    errors: dict[str, str] | None = None,
+) -> ConfigFlowResult:
+    """Show the pairing form."""
     # Try to auto-fill names from Home Assistant user
     default_first_name = ""
     default_last_name = ""
@@ -157,7 +242,7 @@ async def _async_step_pair_common(
                 ),
             }
         ),
-        errors=_errors,
+        errors=errors or {},
         description_placeholders={
             "cic": flow.cic_name,
         },
@@ -187,6 +272,8 @@ class QuattFlowHandler(ConfigFlow, domain=DOMAIN):
         self.ip_address: str | None = None
         self.cic_name: str | None = None
         self.connection_type: str | None = None
+        self.pair_task: asyncio.Task[bool] | None = None
+        self.pair_input: dict | None = None
 
     def is_valid_ip(self, ip_str) -> bool:
         """Check for valid ip."""
@@ -275,6 +362,16 @@ class QuattFlowHandler(ConfigFlow, domain=DOMAIN):
             self, config_update=False, user_input=user_input
         )
 
+    async def async_step_pair_finish(self, user_input=None) -> ConfigFlowResult:
+        """Handle the pairing result in the config flow."""
+        return await _async_step_pair_finish_common(self, config_update=False)
+
+    @callback
+    def async_remove(self) -> None:
+        """Stop pairing when the flow is aborted."""
+        if self.pair_task is not None:
+            self.pair_task.cancel()
+
     async def async_step_dhcp(
         self, discovery_info: DhcpServiceInfo
     ) -> ConfigFlowResult:
@@ -394,6 +491,8 @@ class QuattOptionsFlowHandler(OptionsFlow):
     def __init__(self) -> None:
         """Initialize options flow."""
         self.cic_name: str | None = None
+        self.pair_task: asyncio.Task[bool] | None = None
+        self.pair_input: dict | None = None
 
     async def async_step_init(self, user_input=None) -> ConfigFlowResult:
         """Manage the options."""
@@ -458,6 +557,15 @@ class QuattOptionsFlowHandler(OptionsFlow):
                     mode=selector.NumberSelectorMode.BOX,
                 )
             ),
+            vol.Required(
+                CONF_ENERGY_MAX_INTERVAL,
+                default=self.config_entry.options.get(
+                    CONF_ENERGY_MAX_INTERVAL, DEFAULT_ENERGY_MAX_INTERVAL
+                ),
+            ): vol.All(
+                vol.Coerce(int),
+                vol.Range(min=ENERGY_MIN_MAX_INTERVAL, max=ENERGY_MAX_MAX_INTERVAL),
+            ),
             vol.Optional(
                 CONF_POWER_SENSOR,
                 description={
@@ -489,3 +597,13 @@ class QuattOptionsFlowHandler(OptionsFlow):
         return await _async_step_pair_common(
             self, config_update=True, user_input=user_input
         )
+
+    async def async_step_pair_finish(self, user_input=None) -> ConfigFlowResult:
+        """Handle the pairing result in the options flow."""
+        return await _async_step_pair_finish_common(self, config_update=True)
+
+    @callback
+    def async_remove(self) -> None:
+        """Stop pairing when the flow is aborted."""
+        if self.pair_task is not None:
+            self.pair_task.cancel()
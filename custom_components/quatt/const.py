@@ -16,6 +16,7 @@ CARD_MOUNT = "/quatt-dashboard-card"
 CONF_POWER_SENSOR = "power_sensor"
 CONF_REMOTE_CIC = "cic"
 CONF_LOCAL_CIC = "ip_address"
+CONF_ENERGY_MAX_INTERVAL = "energy_max_interval"
 
 # Remote API URLs (from kwatt)
 FIREBASE_INSTALLATIONS_URL = "https://firebaseinstallations.googleapis.com/v1/projects/quatt-production/installations"
@@ -44,6 +45,15 @@ GOOGLE_FIREBASE_CLIENT = (
 STORAGE_KEY = "quatt_remote_storage"
 STORAGE_VERSION = 1
 
+# Storage key for the integrated energy counters
+ENERGY_STORAGE_KEY = "quatt_energy_storage"
+
+# Storage key for the cached insights
+INSIGHTS_STORAGE_KEY = "quatt_insights_storage"
+
+# Storage key for the transferred bytes of the remote API per day
+TRANSFER_STATS_STORAGE_KEY = "quatt_transfer_storage"
+
 # System types
 DUO_HEATPUMP_SYSTEM = "Duo heatpump system"
 ALL_ELECTRIC_SYSTEM = "All electric system"
@@ -201,11 +211,54 @@ REMOTE_MIN_SCAN_INTERVAL: Final = 1
 REMOTE_MAX_SCAN_INTERVAL: Final = 10
 REMOTE_CONF_SCAN_INTERVAL: Final = "remote_scan_interval"
 INSIGHTS_REMOTE_SCAN_INTERVAL: Final = 60
+# Maximum number of cached insights responses and the delay (seconds) to save them
+INSIGHTS_CACHE_SIZE: Final = 64
+INSIGHTS_CACHE_SAVE_DELAY: Final = 60
+# Maximum number of concurrent insights requests of a single service call
+INSIGHTS_SERVICE_MAX_PARALLEL: Final = 3
+# Hours after the end of an hourly insights bucket before it is imported as statistic
+INSIGHTS_STATISTICS_DELAY: Final = 2
+# Maximum number of responses kept for conditional requests
+CONDITIONAL_CACHE_SIZE: Final = 32
+# Number of days the transferred bytes of the remote API are kept
+TRANSFER_STATS_DAYS: Final = 7
+TRANSFER_STATS_SAVE_DELAY: Final = 600
+# Seconds the Firebase remote config and the installation ID are reused
+FIREBASE_REMOTE_CONFIG_TTL: Final = 12 * 3600
+INSTALLATION_ID_TTL: Final = 7 * 24 * 3600
+# Delay (seconds) to combine token changes into a single write
+TOKEN_SAVE_DELAY: Final = 10
+# Requests per second and burst size of the requests to the Quatt API per account
+REMOTE_REQUEST_RATE: Final = 1.0
+REMOTE_REQUEST_BURST: Final = 10
+# Maximum number of concurrent requests to the Quatt API of all config entries
+FLEET_MAX_REMOTE_REQUESTS: Final = 4
+# Delay (seconds) after a rate limited response without Retry-After header, and the
+# longest delay (seconds) a rate limited request is retried after
+REMOTE_RETRY_AFTER_DEFAULT: Final = 60
+REMOTE_RETRY_AFTER_MAX: Final = 30
+# Delay (seconds) to combine settings changes into a single write to the CIC
+SETTINGS_WRITE_DELAY: Final = 0.5
+# Delay (seconds) before the written settings are confirmed with the remote API
+SETTINGS_CONFIRM_DELAY: Final = 10
+# Number of hours of local samples kept for the rolling window sensors
+LOCAL_HISTORY_HOURS: Final = 1
+# Energy integration (seconds), larger gaps between samples are not integrated
+DEFAULT_ENERGY_MAX_INTERVAL: Final = 300
+ENERGY_MIN_MAX_INTERVAL: Final = 10
+ENERGY_MAX_MAX_INTERVAL: Final = 3600
+ENERGY_SAVE_DELAY: Final = 60
+# Maximum age (seconds) of the power sensor readings kept to align them with the
+# local samples, the readings since the current sample are kept up to this age
+POWER_SENSOR_MAX_AGE: Final = 1800
+# Number of local samples used to estimate the offset of the CIC clock
+CIC_CLOCK_OFFSET_SAMPLES: Final = 10
 
 
 # Temperature-dependent conversion factors for water in a central heating system at 2 bar pressure.
 # The table below provides specific heat capacity (c_p), density (rho), and conversion factors (k)
-# for temperatures ranging from 5°C to 80°C in steps of 5°C.
+# for temperatures ranging from 5°C to 80°C in steps of 5°C. Conversion factors for temperatures
+# in between are linearly interpolated (see water_properties.py).
 
 # Temperature (C) | c_p (J/kg.C) | rho (kg/m^3) | Conversion Factor (k)
 # -------------------------------------------------------------------------
@@ -20,6 +20,7 @@ class QuattDataUpdateCoordinator(DataUpdateCoordinator, ABC):
         hass: HomeAssistant,
         update_interval: timedelta,
         client: QuattApiClient,
+        always_update: bool = True,
     ) -> None:
         """Initialize."""
         self.client = client
@@ -28,6 +29,7 @@ class QuattDataUpdateCoordinator(DataUpdateCoordinator, ABC):
             logger=LOGGER,
             name=DOMAIN,
             update_interval=update_interval,
+            always_update=always_update,
         )
 
         self._power_sensor_id: str | None = (
@@ -0,0 +1,95 @@
+"""Insights DataUpdateCoordinator for Quatt integration."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import date, timedelta
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.update_coordinator import UpdateFailed
+import homeassistant.util.dt as dt_util
+
+from .api_remote import QuattRemoteApiClient
+from .const import LOGGER
+from .coordinator_remote import (
+    QuattRemoteBaseDataUpdateCoordinator,
+    QuattRemoteDataUpdateCoordinator,
+)
+from .insights_statistics import QuattInsightsStatistics
+
+
+def insights_period_starts(today: date) -> dict[str, str]:
+    """Get the start dates of the current insights periods."""
+    return {
+        "day": today.isoformat(),
+        "week": (today - timedelta(days=today.weekday())).isoformat(),
+        "month": today.replace(day=1).isoformat(),
+        "year": today.replace(month=1, day=1).isoformat(),
+    }
+
+
+class QuattInsightsDataUpdateCoordinator(QuattRemoteBaseDataUpdateCoordinator):
+    """Class to manage fetching the insights from the Remote API.
+
+    The insights change slowly, so they are fetched on their own schedule
+    instead of with every CIC data refresh. The installation features are
+    taken from the remote coordinator.
+    """
+
+    client: QuattRemoteApiClient
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        update_interval: timedelta,
+        client: QuattRemoteApiClient,
+        remote_coordinator: QuattRemoteDataUpdateCoordinator,
+    ) -> None:
+        """Initialize."""
+        self._remote_coordinator = remote_coordinator
+        self._statistics = QuattInsightsStatistics(hass, client)
+        super().__init__(hass=hass, update_interval=update_interval, client=client)
+
+    async def _async_update_data(self):
+        """Update the insights via the client.
+
+        Returns: The insights since the start (insights.*) and the insights of the
+                 current day, week, month and year (periods.*)
+        """
+        period_starts = insights_period_starts(dt_util.now().date())
+        insights_data, *period_data = await asyncio.gather(
+            self.client.get_insights(force_refresh=True),
+            *(
+                self.client.get_insights(
+                    from_date=from_date,
+                    timeframe=timeframe,
+                    force_refresh=True,
+                )
+                for timeframe, from_date in period_starts.items()
+            ),
+        )
+        if insights_data is None:
+            raise UpdateFailed("Failed to fetch insights data")
+
+        # Import the hourly buckets of the insights into the long-term statistics,
+        # a failed import is retried with the next update
+        try:
+            await self._statistics.async_import()
+        except Exception:
+            LOGGER.exception("Error importing the insights statistics")
+
+        periods = dict(zip(period_starts, period_data, strict=True))
+        periods["all"] = insights_data
+        return {"insights": insights_data, "periods": periods}
+
+    def heatpump_count(self) -> int:
+        """Get the number of heat pumps."""
+        return self._remote_coordinator.heatpump_count()
+
+    def all_electric_active(self) -> bool:
+        """Check if it is an all electric installation."""
+        return self._remote_coordinator.all_electric_active()
+
+    def is_boiler_opentherm(self) -> bool:
+        """Check if the boiler is connected."""
+        return self._remote_coordinator.is_boiler_opentherm()
@@ -2,22 +2,45 @@
 
 from __future__ import annotations
 
+from collections import deque
+from datetime import timedelta
 import inspect
 import math
 from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import STATE_UNAVAILABLE, STATE_UNKNOWN
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    Event,
+    EventStateChangedData,
+    HomeAssistant,
+    State,
+    callback,
+)
+from homeassistant.helpers.event import async_track_state_change_event
+from homeassistant.helpers.storage import Store
+import homeassistant.util.dt as dt_util
 
+from .api import QuattApiClient
 from .const import (
-    CONVERSION_FACTORS,
+    CIC_CLOCK_OFFSET_SAMPLES,
+    CONF_ENERGY_MAX_INTERVAL,
+    DEFAULT_ENERGY_MAX_INTERVAL,
+    ENERGY_SAVE_DELAY,
+    ENERGY_STORAGE_KEY,
+    LOCAL_HISTORY_HOURS,
     LOGGER,
+    POWER_SENSOR_MAX_AGE,
+    STORAGE_VERSION,
     AllElectricSupervisoryControlMode,
     ElectricityTariffType,
     GasTariffType,
     SupervisoryControlMode,
 )
 from .coordinator import QuattDataUpdateCoordinator
+from .history import SampleHistory
+from .water_properties import CONVERSION_FACTOR_TABLE
 
 
 # https://developers.home-assistant.io/docs/integration_fetching_data#coordinated-single-api-poll-for-data-for-all-entities
@@ -26,6 +49,172 @@ class QuattLocalDataUpdateCoordinator(QuattDataUpdateCoordinator):
 
     config_entry: ConfigEntry
 
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        update_interval: timedelta,
+        client: QuattApiClient,
+    ) -> None:
+        """Initialize."""
+        super().__init__(hass=hass, update_interval=update_interval, client=client)
+
+        # Keep the samples of the last hours for the rolling window sensors
+        self._history = SampleHistory(
+            math.ceil(LOCAL_HISTORY_HOURS * 3600 / update_interval.total_seconds()) + 1
+        )
+        self._sample_time: float | None = None
+        # Time of the current sample on the clock of Home Assistant
+        self._sample_local_time: float | None = None
+        self._clock_offsets: deque[float] = deque(maxlen=CIC_CLOCK_OFFSET_SAMPLES)
+
+        # Recent power sensor readings (timestamp, value) to align with the samples
+        self._power_readings: deque[tuple[float, float | None]] = deque()
+        self._power_listeners: list[CALLBACK_TYPE] = []
+
+        # Energy counters (kWh) integrated from the power values of the samples
+        self._energy: dict[str, float] = {}
+        self._energy_previous: tuple[float, dict[str, float | None]] | None = None
+        energy_max_interval: float = (
+            self.config_entry.options.get(
+                CONF_ENERGY_MAX_INTERVAL, DEFAULT_ENERGY_MAX_INTERVAL
+            )
+            if self.config_entry is not None
+            else DEFAULT_ENERGY_MAX_INTERVAL
+        )
+        # Every interval would be a gap otherwise, so allow at least two intervals
+        min_energy_max_interval = 2 * update_interval.total_seconds()
+        if energy_max_interval < min_energy_max_interval:
+            LOGGER.warning(
+                "Energy integration maximum gap of %ss is too small for the update "
+                "interval, using %ss",
+                energy_max_interval,
+                min_energy_max_interval,
+            )
+            energy_max_interval = min_energy_max_interval
+        self._energy_max_interval = energy_max_interval
+        self._energy_store: Store | None = (
+            Store(
+                hass,
+                STORAGE_VERSION,
+                f"{ENERGY_STORAGE_KEY}_{self.config_entry.unique_id}",
+            )
+            if self.config_entry is not None
+            else None
+        )
+
+    async def _async_update_data(self):
+        """Update data via the client and process the new sample."""
+        data = await super()._async_update_data()
+
+        # The computed values are based on self.data so make the new data current
+        self.data = data
+        received = dt_util.utcnow().timestamp()
+
+        # The CIC can return the same sample twice, only process new samples
+        timestamp = self._sample_timestamp()
+        if self._sample_time is None or timestamp > self._sample_time:
+            # The smallest difference between receiving and taking a sample is
+            # the offset of the CIC clock, the rest is the age of the sample
+            self._clock_offsets.append(received - timestamp)
+            self._sample_local_time = timestamp + min(self._clock_offsets)
+            self._prune_power_readings(received)
+
+            self._record_sample(timestamp)
+            self._integrate_energy(timestamp)
+            self._sample_time = timestamp
+
+        return data
+
+    def _sample_timestamp(self) -> float:
+        """Get the timestamp of the current sample in seconds."""
+        timestamp = self.get_value("time.ts")
+        if timestamp is None:
+            return dt_util.utcnow().timestamp()
+
+        # The CIC reports the timestamp in milliseconds
+        timestamp = float(timestamp)
+        return timestamp / 1000 if timestamp > 1e11 else timestamp
+
+    def _record_sample(self, timestamp: float) -> None:
+        """Add the current sample to the history."""
+        heatpump_2_active = self.heatpump_2_active()
+        self._history.append(
+            timestamp,
+            {
+                "heat_power": self.computedHeatPower(),
+                "power": self.computedPower(),
+                "power_input": self.computedPowerInput(),
+                "water_in": self.get_value("hp1.temperatureWaterIn"),
+                "water_out": self.get_value(
+                    "hp2.temperatureWaterOut"
+                    if heatpump_2_active
+                    else "hp1.temperatureWaterOut"
+                ),
+                "flow_rate": self.get_value("qc.flowRateFiltered"),
+                "supervisory_control_mode": self.get_value("qc.supervisoryControlMode"),
+                "electrical_power": self.electricalPower(),
+            },
+        )
+
+    async def async_load_energy(self) -> None:
+        """Load the energy counters from storage."""
+        if self._energy_store is None:
+            return
+
+        stored_data = await self._energy_store.async_load()
+        if stored_data:
+            self._energy = {
+                counter: float(value)
+                for counter, value in stored_data.get("energy", {}).items()
+            }
+            LOGGER.debug("Loaded stored energy counters: %s", self._energy)
+
+    async def async_save_energy(self) -> None:
+        """Save the energy counters to storage immediately."""
+        if self._energy_store is not None and self._energy:
+            await self._energy_store.async_save(self._energy_data())
+
+    def _energy_data(self) -> dict[str, Any]:
+        """Return the energy counters in the storage format."""
+        return {"energy": dict(self._energy)}
+
+    def _integrate_energy(self, timestamp: float) -> None:
+        """Integrate the power values of the current sample into the energy counters."""
+        powers = {
+            "heat": self.computedHeatPower(),
+            "power": self.computedPower(),
+            "power_input": self.computedPowerInput(),
+            "boiler_heat": self.computedBoilerHeatPower(),
+        }
+
+        previous = self._energy_previous
+        self._energy_previous = (timestamp, powers)
+        if previous is None:
+            return
+
+        # Do not bridge gaps, e.g. when the CIC was unreachable for a while
+        interval = timestamp - previous[0]
+        if interval > self._energy_max_interval:
+            LOGGER.debug("Skipping energy integration over a gap of %ss", interval)
+            return
+
+        for counter, power in powers.items():
+            previous_power = previous[1][counter]
+            if power is None or previous_power is None:
+                continue
+
+            # Trapezoidal rule, negative power (e.g. during defrost) is not counted
+            # because the counters are total_increasing (Wh -> kWh)
+            average_power = (
+                max(float(power), 0.0) + max(float(previous_power), 0.0)
+            ) / 2
+            self._energy[counter] = (
+                self._energy.get(counter, 0.0) + average_power * interval / 3600 / 1000
+            )
+
+        if self._energy_store is not None:
+            self._energy_store.async_delay_save(self._energy_data, ENERGY_SAVE_DELAY)
+
     def heatpump_1_active(self) -> bool:
         """Check if heatpump 1 is active."""
         return self.get_value("hp1") is not None
@@ -43,36 +232,112 @@ class QuattLocalDataUpdateCoordinator(QuattDataUpdateCoordinator):
         return self.get_value("boiler.otFbChModeActive") is not None
 
     def get_conversion_factor(self, temperature: float) -> float:
-        """Get the conversion factor for the nearest temperature."""
-        nearest_temperature = min(
-            CONVERSION_FACTORS.keys(), key=lambda t: abs(t - temperature)
-        )
-        return CONVERSION_FACTORS[nearest_temperature]
+        """Get the interpolated conversion factor for the temperature."""
+        return CONVERSION_FACTOR_TABLE.conversion_factor(temperature)
 
-    def electricalPower(self) -> float | None:  # pylint: disable=invalid-name
-        """Get heatpump power from sensor."""
+    @callback
+    def async_track_power_sensor(self) -> CALLBACK_TYPE | None:
+        """Start caching the state of the power sensor.
+
+        Returns: The callback to stop tracking, or None without power sensor
+        """
         if self._power_sensor_id is None:
             return None
 
-        entity_state = self.hass.states.get(self._power_sensor_id)
-        LOGGER.debug("electricalPower %s", entity_state)
+        self._cache_power_state(self.hass.states.get(self._power_sensor_id))
+        return async_track_state_change_event(
+            self.hass, [self._power_sensor_id], self._async_power_sensor_changed
+        )
+
+    @callback
+    def async_add_power_sensor_listener(
+        self, update_callback: CALLBACK_TYPE
+    ) -> CALLBACK_TYPE:
+        """Listen for power sensor updates.
+
+        Returns: The callback to remove the listener
+        """
+        self._power_listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            self._power_listeners.remove(update_callback)
+
+        return remove_listener
 
+    @callback
+    def _async_power_sensor_changed(self, event: Event[EventStateChangedData]) -> None:
+        """Cache the new power sensor state and notify the listeners."""
+        self._cache_power_state(event.data["new_state"])
+        for update_callback in list(self._power_listeners):
+            update_callback()
+
+    def _cache_power_state(self, entity_state: State | None) -> None:
+        """Parse a power sensor state and add it to the cached readings."""
+        LOGGER.debug("Power sensor state %s", entity_state)
         if entity_state is None:
-            return None
+            return
+
+        value: float | None = None
+        if entity_state.state not in (STATE_UNAVAILABLE, STATE_UNKNOWN):
+            try:
+                value = float(entity_state.state)
+            except (TypeError, ValueError):
+                LOGGER.debug(
+                    "Power sensor '%s' has non-numeric state: %s",
+                    self._power_sensor_id,
+                    entity_state.state,
+                )
+
+        self._power_readings.append((entity_state.last_updated.timestamp(), value))
+        self._prune_power_readings(entity_state.last_updated.timestamp())
+
+    def _prune_power_readings(self, now: float) -> None:
+        """Drop the power sensor readings that are older than the current sample.
+
+        The last reading before the sample is kept to align the readings with the
+        sample. Without new samples the readings are kept up to POWER_SENSOR_MAX_AGE.
+        """
+        cutoff = now - POWER_SENSOR_MAX_AGE
+        if self._sample_local_time is not None:
+            cutoff = max(cutoff, self._sample_local_time)
+
+        readings = self._power_readings
+        while len(readings) > 1 and readings[1][0] <= cutoff:
+            readings.popleft()
 
-        if entity_state.state in (STATE_UNAVAILABLE, STATE_UNKNOWN):
-            return None
+    def electricalPower(self) -> float | None:  # pylint: disable=invalid-name
+        """Get heatpump power from sensor, aligned with the time of the CIC sample.
 
-        try:
-            return float(entity_state.state)
-        except (TypeError, ValueError):
-            LOGGER.debug(
-                "Power sensor '%s' has non-numeric state: %s",
-                self._power_sensor_id,
-                entity_state.state,
-            )
+        Between two power sensor readings the value is interpolated, otherwise the
+        nearest reading is used.
+        """
+        if self._power_sensor_id is None or not self._power_readings:
             return None
 
+        # The time the CIC took the sample, so a late poll does not shift it
+        sample_time = self._sample_local_time
+        if sample_time is None:
+            return self._power_readings[-1][1]
+
+        before: tuple[float, float | None] | None = None
+        after: tuple[float, float | None] | None = None
+        for reading in self._power_readings:
+            if reading[0] <= sample_time:
+                before = reading
+            else:
+                after = reading
+                break
+
+        if before is None or after is None:
+            return (before or after)[1]
+
+        if before[1] is None or after[1] is None:
+            return before[1]
+
+        fraction = (sample_time - before[0]) / (after[0] - before[0])
+        return before[1] + (after[1] - before[1]) * fraction
+
     def computedWaterDelta(self, parent_key: str | None = None) -> float | None:  # pylint: disable=invalid-name
         """Compute waterdelta."""
         if parent_key is None:
@@ -318,6 +583,70 @@ class QuattLocalDataUpdateCoordinator(QuattDataUpdateCoordinator):
             and water_delta < -1
         )
 
+    def _average_cop(self, seconds: float) -> float | None:
+        """Compute the average COP based on the power sensor over a window."""
+        value = self._history.ratio("heat_power", "electrical_power", seconds)
+        return None if value is None else round(value, 2)
+
+    def _average_quatt_cop(self, seconds: float) -> float | None:
+        """Compute the average Quatt COP over a window."""
+        value = self._history.ratio("power", "power_input", seconds)
+        return None if value is None else round(value, 2)
+
+    def computedAverageCop15m(self) -> float | None:  # pylint: disable=invalid-name
+        """Compute the average COP over the last 15 minutes."""
+        return self._average_cop(15 * 60)
+
+    def computedAverageCop1h(self) -> float | None:  # pylint: disable=invalid-name
+        """Compute the average COP over the last hour."""
+        return self._average_cop(60 * 60)
+
+    def computedAverageQuattCop15m(self) -> float | None:  # pylint: disable=invalid-name
+        """Compute the average Quatt COP over the last 15 minutes."""
+        return self._average_quatt_cop(15 * 60)
+
+    def computedAverageQuattCop1h(self) -> float | None:  # pylint: disable=invalid-name
+        """Compute the average Quatt COP over the last hour."""
+        return self._average_quatt_cop(60 * 60)
+
+    def computedAverageHeatPower1h(self) -> float | None:  # pylint: disable=invalid-name
+        """Compute the average heat power over the last hour."""
+        value = self._history.mean("heat_power", 60 * 60)
+        return None if value is None else round(value, 2)
+
+    def computedCompressorDutyCycle1h(self) -> float | None:  # pylint: disable=invalid-name
+        """Compute the percentage of the last hour the heatpump was heating."""
+        value = self._history.fraction(
+            "supervisory_control_mode",
+            (
+                SupervisoryControlMode.HEATING_HEATPUMP_ONLY,
+                SupervisoryControlMode.HEATING_HEATPUMP_PLUS_BOILER,
+            ),
+            60 * 60,
+        )
+        return None if value is None else round(value * 100, 1)
+
+    def _energy_counter(self, counter: str) -> float | None:
+        """Get the value of an energy counter."""
+        value = self._energy.get(counter)
+        return None if value is None else round(value, 3)
+
+    def computedHeatEnergy(self) -> float | None:  # pylint: disable=invalid-name
+        """Get the integrated heat energy."""
+        return self._energy_counter("heat")
+
+    def computedEnergy(self) -> float | None:  # pylint: disable=invalid-name
+        """Get the integrated energy output of the heatpumps."""
+        return self._energy_counter("power")
+
+    def computedEnergyInput(self) -> float | None:  # pylint: disable=invalid-name
+        """Get the integrated energy input of the heatpumps."""
+        return self._energy_counter("power_input")
+
+    def computedBoilerHeatEnergy(self) -> float | None:  # pylint: disable=invalid-name
+        """Get the integrated heat energy added by the boiler."""
+        return self._energy_counter("boiler_heat")
+
     def computedSupervisoryControlMode(self) -> str | None:  # pylint: disable=invalid-name
         """Map the numeric supervisoryControlMode to a textual status."""
         state = self.get_value("qc.supervisoryControlMode")
@@ -2,19 +2,41 @@
 
 from __future__ import annotations
 
+from datetime import timedelta
 from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
 
+from .api import QuattApiClient
 from .const import LOGGER
 from .coordinator import QuattDataUpdateCoordinator
+from .settings_queue import QuattSettingsQueue
 
 
-class QuattRemoteDataUpdateCoordinator(QuattDataUpdateCoordinator):
-    """Class to manage fetching data from the Remote API."""
+class QuattRemoteBaseDataUpdateCoordinator(QuattDataUpdateCoordinator):
+    """Base class to manage fetching data from the Remote API."""
 
     config_entry: ConfigEntry
 
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        update_interval: timedelta,
+        client: QuattApiClient,
+    ) -> None:
+        """Initialize.
+
+        Unchanged responses result in the same data, the entities are only
+        updated when the data changed.
+        """
+        super().__init__(
+            hass=hass,
+            update_interval=update_interval,
+            client=client,
+            always_update=False,
+        )
+
     def get_value(self, value_path: str, default: Any | None = None) -> Any:
         """Retrieve a value by dot notation from the remote API response.
 
@@ -73,3 +95,18 @@ class QuattRemoteDataUpdateCoordinator(QuattDataUpdateCoordinator):
         # connected but not OpenTherm. The sensors using this field should be only
         # used on the local API when OpenTherm is present.
         return self.get_value("isBoilerConnected") or False
+
+
+class QuattRemoteDataUpdateCoordinator(QuattRemoteBaseDataUpdateCoordinator):
+    """Class to manage fetching the CIC data from the Remote API."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        update_interval: timedelta,
+        client: QuattApiClient,
+    ) -> None:
+        """Initialize."""
+        super().__init__(hass=hass, update_interval=update_interval, client=client)
+        # Only the CIC data contains the settings
+        self.settings_queue = QuattSettingsQueue(self)
@@ -0,0 +1,43 @@
+"""Diagnostics support for Quatt."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_LOCAL_CIC, CONF_REMOTE_CIC, DOMAIN
+
+TO_REDACT = {CONF_LOCAL_CIC, CONF_REMOTE_CIC}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinators = hass.data[DOMAIN][entry.entry_id]
+
+    diagnostics: dict[str, Any] = {
+        "entry": {
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "coordinators": {
+            name: {
+                "last_update_success": coordinator.last_update_success,
+                "update_interval": str(coordinator.update_interval),
+            }
+            for name, coordinator in coordinators.items()
+            if coordinator
+        },
+    }
+
+    # Bytes received from the remote API, e.g. for metered connections
+    if remote_coordinator := coordinators["remote"]:
+        diagnostics["remote_transfer"] = (
+            remote_coordinator.client.transfer_stats.as_dict()
+        )
+
+    return diagnostics
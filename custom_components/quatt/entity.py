@@ -7,6 +7,7 @@ from dataclasses import dataclass
 from datetime import date, datetime
 from decimal import Decimal
 import logging
+from typing import Any
 
 from homeassistant.components.binary_sensor import (
     BinarySensorEntity,
@@ -35,6 +36,7 @@ from .const import (
     QuattDeviceKind,
 )
 from .coordinator import QuattDataUpdateCoordinator
+from .coordinator_local import QuattLocalDataUpdateCoordinator
 from .coordinator_remote import QuattRemoteDataUpdateCoordinator
 
 _LOGGER = logging.getLogger(__name__)
@@ -126,6 +128,44 @@ class QuattSensor(QuattEntity, SensorEntity):
         return value
 
 
+class QuattCopSensor(QuattSensor):
+    """Quatt Sensor class for values based on the external power sensor.
+
+    Updates on new CIC samples and on power sensor changes.
+    """
+
+    async def async_added_to_hass(self) -> None:
+        """Register the power sensor listener."""
+        await super().async_added_to_hass()
+        if isinstance(self.coordinator, QuattLocalDataUpdateCoordinator):
+            self.async_on_remove(
+                self.coordinator.async_add_power_sensor_listener(
+                    self._handle_coordinator_update
+                )
+            )
+
+
+class QuattInsightsSensor(QuattSensor):
+    """Quatt Sensor class for the insights of a period.
+
+    The state is the heat pump heat of the period, the insights are exposed as
+    attributes. The graph is not recorded, it is only needed for the charts.
+    """
+
+    _unrecorded_attributes = frozenset({"graph"})
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the heat pump heat of the period."""
+        return self.coordinator.get_value(f"{self.entity_description.key}.totalHpHeat")
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Expose the insights of the period as state attributes."""
+        insights = self.coordinator.get_value(self.entity_description.key)
+        return dict(insights) if isinstance(insights, dict) else None
+
+
 class QuattSystemSensor(QuattSensor):
     """Quatt System Sensor class."""
 
@@ -229,9 +269,6 @@ class QuattSelect(QuattEntity, SelectEntity):
             _LOGGER.warning("Failed to update %s", self.entity_description.key)
             raise RuntimeError(f"Failed to update {self.entity_description.key}")
 
-        # Always refresh coordinator data after a successful update
-        await self.coordinator.async_request_refresh()
-
 
 class QuattSoundSelect(QuattSelect):
     """Select entity for Quatt sound level configuration."""
@@ -244,9 +281,11 @@ class QuattSoundSelect(QuattSelect):
             _LOGGER.error("Cannot update %s: remote client required", self.entity_description.key)
             return False
 
-        # Get current values for both sound levels
-        day_level = self.coordinator.get_value("dayMaxSoundLevel")
-        night_level = self.coordinator.get_value("nightMaxSoundLevel")
+        # Get current values for both sound levels, including the queued changes so
+        # changing both levels at once does not revert one of them
+        settings_queue = self.coordinator.settings_queue
+        day_level = settings_queue.get_value("dayMaxSoundLevel")
+        night_level = settings_queue.get_value("nightMaxSoundLevel")
 
         # Update the value that changed
         if self.entity_description.key == "dayMaxSoundLevel":
@@ -270,7 +309,7 @@ class QuattSoundSelect(QuattSelect):
         }
 
         _LOGGER.debug("Updating CIC sound levels: %s", settings)
-        return await remote_client.update_cic_settings(settings)
+        return await settings_queue.async_update(settings)
 
 
 class QuattSwitch(QuattEntity, SwitchEntity):
@@ -348,9 +387,6 @@ class QuattSwitch(QuattEntity, SwitchEntity):
             _LOGGER.warning("Failed to update %s", self.entity_description.key)
             raise RuntimeError(f"Failed to update {self.entity_description.key}")
 
-        # Always refresh coordinator data after a successful update
-        await self.coordinator.async_request_refresh()
-
 
 class QuattSettingSwitch(QuattSwitch):
     """Switch entity for Quatt boolean settings."""
@@ -378,7 +414,7 @@ class QuattSettingSwitch(QuattSwitch):
                 current = current[part]
 
         _LOGGER.debug("Updating CIC setting: %s", settings)
-        return await remote_client.update_cic_settings(settings)
+        return await self.coordinator.settings_queue.async_update(settings)
 
 
 @dataclass(frozen=True)
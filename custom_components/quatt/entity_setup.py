@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from collections.abc import Container
 import logging
 
 from homeassistant.core import HomeAssistant
@@ -21,8 +22,14 @@ async def async_setup_entities(
     remote: bool,
     entity_descriptions: dict[str, list],
     entity_domain: str,
+    entity_devices: Container[str] | None = None,
 ):
-    """Set up the binary_sensor platform."""
+    """Set up the binary_sensor platform.
+
+    Entities are only created for the devices in entity_devices (default all). The
+    removal of obsolete entities is based on all entity descriptions, so the
+    descriptions of devices handled by another coordinator must still be passed.
+    """
     registry = er.async_get(hass)
 
     # Cache the active states
@@ -109,6 +116,10 @@ async def async_setup_entities(
     device_kind_map = {d["id"]: d["kind"] for d in DEVICE_LIST}
     sensors: list = []
     for device_id, sensor_descriptions in entity_descriptions.items():
+        # Skip devices that are handled by another coordinator
+        if entity_devices is not None and device_id not in entity_devices:
+            continue
+
         device_kind = device_kind_map.get(device_id, QuattDeviceKind.DEVICE)
         for sensor_description in sensor_descriptions:
             # Skip sensors that are not selected based on the installation type
@@ -0,0 +1,88 @@
+"""Polling coordination of all Quatt config entries."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime
+import logging
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+
+from .const import DOMAIN, FLEET_MAX_REMOTE_REQUESTS
+
+_LOGGER = logging.getLogger(__name__)
+
+# Fraction of the golden ratio, spreads the phases evenly for any number of entries
+_PHASE_STEP = 0.6180339887498949
+
+
+class QuattFleet:
+    """Spread the polling of all config entries.
+
+    Every entry gets a slot, the slot determines the phase of its polls within
+    the update interval so CICs are not polled at the same moment. The number of
+    concurrent requests to the Quatt API of all entries is limited. The remote
+    clients share the session of Home Assistant, so connections to the Quatt API
+    are already pooled per host.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the fleet."""
+        self.remote_requests = asyncio.Semaphore(FLEET_MAX_REMOTE_REQUESTS)
+        self._slots: dict[str, int] = {}
+
+    @callback
+    def async_add_entry(self, entry_id: str) -> None:
+        """Assign the lowest free slot to the entry."""
+        if entry_id in self._slots:
+            return
+
+        used = set(self._slots.values())
+        self._slots[entry_id] = next(
+            slot for slot in range(len(used) + 1) if slot not in used
+        )
+
+    @callback
+    def async_remove_entry(self, entry_id: str) -> None:
+        """Release the slot of the entry."""
+        self._slots.pop(entry_id, None)
+
+    def phase(self, entry_id: str) -> float:
+        """Get the phase of the entry as fraction of the update interval."""
+        return (self._slots.get(entry_id, 0) * _PHASE_STEP) % 1
+
+    @callback
+    def async_stagger(
+        self,
+        hass: HomeAssistant,
+        entry_id: str,
+        coordinator: DataUpdateCoordinator,
+    ) -> CALLBACK_TYPE | None:
+        """Move the polls of the coordinator to the phase of the entry.
+
+        The coordinator schedules the next poll an update interval after the
+        last one, so a single refresh at the phase moves all following polls.
+        """
+        if coordinator.update_interval is None:
+            return None
+
+        delay = self.phase(entry_id) * coordinator.update_interval.total_seconds()
+        if delay < 1:
+            return None
+
+        async def _async_refresh(_now: datetime) -> None:
+            await coordinator.async_request_refresh()
+
+        _LOGGER.debug("Moving the polls of %s by %.1fs", coordinator.name, delay)
+        return async_call_later(hass, delay, _async_refresh)
+
+
+@callback
+def async_get_fleet(hass: HomeAssistant) -> QuattFleet:
+    """Get the fleet of all config entries."""
+    key = f"_{DOMAIN}_fleet"
+    if key not in hass.data:
+        hass.data[key] = QuattFleet()
+    return hass.data[key]
@@ -0,0 +1,130 @@
+"""In-memory history of recent local samples."""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Container, Iterator, Mapping
+import math
+
+# Signals kept for every sample, missing values are stored as NaN
+HISTORY_SIGNALS = (
+    "heat_power",
+    "power",
+    "power_input",
+    "water_in",
+    "water_out",
+    "flow_rate",
+    "supervisory_control_mode",
+    "electrical_power",
+)
+
+
+class SampleHistory:
+    """Fixed size ring buffer of numeric samples.
+
+    Every signal is stored in its own array so the buffer does not allocate per
+    sample. When the buffer is full the oldest sample is overwritten.
+    """
+
+    __slots__ = ("_capacity", "_next", "_signals", "_size", "_timestamps")
+
+    def __init__(self, capacity: int) -> None:
+        """Initialize the buffer for the given number of samples."""
+        if capacity < 1:
+            raise ValueError("Capacity must be at least 1")
+
+        self._capacity = capacity
+        self._next = 0
+        self._size = 0
+        self._timestamps = array("d", bytes(8 * capacity))
+        self._signals = {
+            signal: array("d", bytes(8 * capacity)) for signal in HISTORY_SIGNALS
+        }
+
+    def __len__(self) -> int:
+        """Return the number of samples in the buffer."""
+        return self._size
+
+    @property
+    def latest_timestamp(self) -> float | None:
+        """Return the timestamp of the newest sample."""
+        if self._size == 0:
+            return None
+        return self._timestamps[(self._next - 1) % self._capacity]
+
+    def append(self, timestamp: float, values: Mapping[str, float | None]) -> None:
+        """Add a sample, signals that are missing or None are stored as NaN."""
+        self._timestamps[self._next] = timestamp
+        for signal, column in self._signals.items():
+            value = values.get(signal)
+            column[self._next] = math.nan if value is None else float(value)
+
+        self._next = (self._next + 1) % self._capacity
+        self._size = min(self._size + 1, self._capacity)
+
+    def _window(self, seconds: float) -> Iterator[int]:
+        """Iterate over the buffer indexes of the samples within the window.
+
+        The window ends at the newest sample, iteration goes from new to old.
+        """
+        latest = self.latest_timestamp
+        if latest is None:
+            return
+
+        start = latest - seconds
+        for offset in range(1, self._size + 1):
+            index = (self._next - offset) % self._capacity
+            if self._timestamps[index] < start:
+                return
+            yield index
+
+    def mean(self, signal: str, seconds: float) -> float | None:
+        """Return the average of a signal over the window."""
+        column = self._signals[signal]
+        total = 0.0
+        count = 0
+        for index in self._window(seconds):
+            value = column[index]
+            if not math.isnan(value):
+                total += value
+                count += 1
+
+        return total / count if count else None
+
+    def ratio(self, numerator: str, denominator: str, seconds: float) -> float | None:
+        """Return the ratio of the sums of two signals over the window.
+
+        Only samples where both signals are available are taken into account.
+        """
+        numerator_column = self._signals[numerator]
+        denominator_column = self._signals[denominator]
+        numerator_total = 0.0
+        denominator_total = 0.0
+        for index in self._window(seconds):
+            numerator_value = numerator_column[index]
+            denominator_value = denominator_column[index]
+            if math.isnan(numerator_value) or math.isnan(denominator_value):
+                continue
+            numerator_total += numerator_value
+            denominator_total += denominator_value
+
+        if denominator_total == 0:
+            return None
+        return numerator_total / denominator_total
+
+    def fraction(
+        self, signal: str, values: Container[float], seconds: float
+    ) -> float | None:
+        """Return the fraction of samples within the window where signal is in values."""
+        column = self._signals[signal]
+        matches = 0
+        count = 0
+        for index in self._window(seconds):
+            value = column[index]
+            if math.isnan(value):
+                continue
+            count += 1
+            if value in values:
+                matches += 1
+
+        return matches / count if count else None
@@ -0,0 +1,187 @@
+"""Persistent cache for the insights of the remote API."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from datetime import date, datetime, timedelta, timezone
+import logging
+import time
+from typing import Any, NamedTuple
+
+from .const import (
+    INSIGHTS_CACHE_SAVE_DELAY,
+    INSIGHTS_CACHE_SIZE,
+    INSIGHTS_REMOTE_SCAN_INTERVAL,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+InsightsKey = tuple[str, str, bool]
+
+
+class CachedInsights(NamedTuple):
+    """Insights from the cache and whether they are still fresh."""
+
+    result: dict[str, Any]
+    fresh: bool
+
+
+# Graph fields per day and the totals of the insights they add up to
+_GRAPH_TOTALS = {
+    "hpHeat": "totalHpHeat",
+    "hpElectric": "totalHpElectric",
+    "boilerHeat": "totalBoilerHeat",
+}
+_TOTALS = (*_GRAPH_TOTALS.values(), "totalBoilerGas")
+
+
+class InsightsIncrement(NamedTuple):
+    """Insights of a period with the insights of the current day at that time."""
+
+    day: str
+    base: dict[str, Any]
+    day_base: dict[str, Any]
+
+
+def insights_period_end(from_date: str, timeframe: str) -> date | None:
+    """Get the first day after the period, None if the period is never closed."""
+    try:
+        start = date.fromisoformat(from_date)
+    except ValueError:
+        return None
+
+    if timeframe == "day":
+        return start + timedelta(days=1)
+    if timeframe == "week":
+        return start + timedelta(days=7)
+    if timeframe == "month":
+        return (
+            date(start.year + 1, 1, 1)
+            if start.month == 12
+            else date(start.year, start.month + 1, 1)
+        )
+    if timeframe == "year":
+        return date(start.year + 1, 1, 1)
+    return None
+
+
+def _expires_at(key: InsightsKey) -> float | None:
+    """Get the expiry (epoch seconds) of the insights, None if they never expire.
+
+    Insights of a closed period do not change anymore. A day of margin is used
+    so late data and time zone differences are still picked up.
+    """
+    from_date, timeframe, _advanced_insights = key
+    period_end = insights_period_end(from_date, timeframe)
+    today = datetime.now(timezone.utc).date()  # noqa: UP017
+    if period_end is not None and period_end + timedelta(days=1) <= today:
+        return None
+    return time.time() + INSIGHTS_REMOTE_SCAN_INTERVAL * 60
+
+
+def merge_day_insights(
+    base: dict[str, Any], day_base: dict[str, Any], day: dict[str, Any]
+) -> dict[str, Any] | None:
+    """Apply the change of the current day to the insights of a longer period.
+
+    Args: base: The insights of the period
+          day_base: The insights of the current day when base was requested
+          day: The latest insights of the current day
+
+    Returns: The updated insights of the period, or None if the current day is
+             not part of the graph of the period
+    """
+    graph = [dict(point) for point in base.get("graph") or []]
+    bucket = next(
+        (point for point in graph if point.get("timestamp") == day.get("from")), None
+    )
+    if bucket is None or day_base.get("from") != day.get("from"):
+        return None
+
+    merged = {**base, "graph": graph}
+    for field, total in _GRAPH_TOTALS.items():
+        bucket[field] = (bucket.get(field) or 0) + (
+            (day.get(total) or 0) - (day_base.get(total) or 0)
+        )
+    for total in _TOTALS:
+        merged[total] = (base.get(total) or 0) + (
+            (day.get(total) or 0) - (day_base.get(total) or 0)
+        )
+
+    if merged["totalHpElectric"]:
+        merged["averageCOP"] = round(
+            merged["totalHpHeat"] / merged["totalHpElectric"], 2
+        )
+    return merged
+
+
+class InsightsCache:
+    """Size bounded LRU cache of insights responses.
+
+    Entries of open periods expire after the insights scan interval, but are
+    kept as fallback for failing requests until they are evicted. Entries of
+    closed periods never expire. The cache is persisted when a store is given.
+    """
+
+    def __init__(self, store=None, max_entries: int = INSIGHTS_CACHE_SIZE) -> None:
+        """Initialize the cache."""
+        self._store = store
+        self._max_entries = max_entries
+        self._save_pending = False
+        self._entries: OrderedDict[InsightsKey, tuple[float | None, dict[str, Any]]] = (
+            OrderedDict()
+        )
+
+    def __len__(self) -> int:
+        """Return the number of cached entries."""
+        return len(self._entries)
+
+    def get(self, key: InsightsKey) -> CachedInsights | None:
+        """Get the cached insights, also when they are expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        self._entries.move_to_end(key)
+        expires_at, result = entry
+        return CachedInsights(result, expires_at is None or expires_at > time.time())
+
+    def set(self, key: InsightsKey, result: dict[str, Any]) -> None:
+        """Cache the insights and evict the least recently used entries."""
+        self._entries[key] = (_expires_at(key), result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            evicted_key, _entry = self._entries.popitem(last=False)
+            _LOGGER.debug("Removing cached insights: %s", evicted_key)
+
+        if self._store:
+            self._save_pending = True
+            self._store.async_delay_save(self._data_to_store, INSIGHTS_CACHE_SAVE_DELAY)
+
+    async def async_load(self) -> None:
+        """Load the cached insights from storage."""
+        if not self._store or not (stored := await self._store.async_load()):
+            return
+
+        for entry in stored.get("entries", [])[-self._max_entries :]:
+            from_date, timeframe, advanced_insights = entry["key"]
+            self._entries[(from_date, timeframe, advanced_insights)] = (
+                entry["expires_at"],
+                entry["result"],
+            )
+        _LOGGER.debug("Loaded %s cached insights from storage", len(self._entries))
+
+    async def async_save(self) -> None:
+        """Write pending changes of the cached insights to storage immediately."""
+        if self._store and self._save_pending:
+            await self._store.async_save(self._data_to_store())
+
+    def _data_to_store(self) -> dict[str, Any]:
+        """Return the cached insights to store, in least recently used order."""
+        self._save_pending = False
+        return {
+            "entries": [
+                {"key": list(key), "expires_at": expires_at, "result": result}
+                for key, (expires_at, result) in self._entries.items()
+            ]
+        }
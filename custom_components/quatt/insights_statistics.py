@@ -0,0 +1,152 @@
+"""Import of the insights into the long-term statistics of Home Assistant."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterable
+from datetime import datetime, timedelta
+import logging
+from typing import Any
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import (
+    StatisticData,
+    StatisticMeanType,
+    StatisticMetaData,
+)
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+    get_last_statistics,
+)
+from homeassistant.const import UnitOfEnergy
+from homeassistant.core import HomeAssistant
+from homeassistant.util import slugify
+import homeassistant.util.dt as dt_util
+
+from .api_remote import QuattRemoteApiClient
+from .const import DOMAIN, INSIGHTS_STATISTICS_DELAY
+
+_LOGGER = logging.getLogger(__name__)
+
+# Graph field of the hourly insights -> (statistic object id suffix, name)
+INSIGHTS_STATISTICS = {
+    "hpHeat": ("heat_pump_heat", "Heat pump heat"),
+    "hpElectric": ("heat_pump_electric", "Heat pump electric"),
+    "boilerHeat": ("boiler_heat", "Boiler heat"),
+}
+
+
+class QuattInsightsStatistics:
+    """Import the hourly insights as external statistics.
+
+    The hourly buckets of yesterday and today are imported once they are closed
+    for INSIGHTS_STATISTICS_DELAY hours, so the Quatt backend had the time to
+    complete them. Only buckets newer than the last imported statistic are
+    imported and the sum continues from that statistic.
+    """
+
+    def __init__(self, hass: HomeAssistant, client: QuattRemoteApiClient) -> None:
+        """Initialize."""
+        self._hass = hass
+        self._client = client
+        # Last imported statistic per statistic id: (start timestamp, sum)
+        self._last_statistics: dict[str, tuple[float, float]] = {}
+
+    def _statistic_id(self, object_id: str) -> str:
+        """Get the external statistic id for the CIC."""
+        return f"{DOMAIN}:{slugify(self._client.cic)}_{object_id}"
+
+    async def async_import(self) -> None:
+        """Import the closed hourly buckets that are not imported yet."""
+        if "recorder" not in self._hass.config.components:
+            return
+
+        today = dt_util.now().date()
+        days = await asyncio.gather(
+            *(
+                self._client.get_insights(
+                    from_date=day.isoformat(), timeframe="day", advanced_insights=False
+                )
+                for day in (today - timedelta(days=1), today)
+            )
+        )
+        buckets = self._closed_buckets(
+            point
+            for insights in days
+            if insights is not None
+            for point in insights.get("graph") or []
+        )
+        if not buckets:
+            return
+
+        for field, (object_id, name) in INSIGHTS_STATISTICS.items():
+            statistic_id = self._statistic_id(object_id)
+            last_start, last_sum = await self._async_last_statistic(statistic_id)
+
+            statistics: list[StatisticData] = []
+            for start, point in buckets:
+                value = point.get(field)
+                if start.timestamp() <= last_start or value is None:
+                    continue
+
+                # Wh to kWh
+                last_sum += value / 1000
+                last_start = start.timestamp()
+                statistics.append(
+                    StatisticData(start=start, state=value / 1000, sum=last_sum)
+                )
+
+            if not statistics:
+                continue
+
+            _LOGGER.debug("Importing %s statistics: %s", len(statistics), statistic_id)
+            async_add_external_statistics(
+                self._hass,
+                StatisticMetaData(
+                    has_mean=False,
+                    mean_type=StatisticMeanType.NONE,
+                    has_sum=True,
+                    name=f"{self._client.cic} {name}",
+                    source=DOMAIN,
+                    statistic_id=statistic_id,
+                    unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+                ),
+                statistics,
+            )
+            self._last_statistics[statistic_id] = (last_start, last_sum)
+
+    @staticmethod
+    def _closed_buckets(
+        points: Iterable[dict[str, Any]],
+    ) -> list[tuple[datetime, dict[str, Any]]]:
+        """Get the hourly buckets that are closed long enough, ordered by start."""
+        cutoff = dt_util.utcnow() - timedelta(hours=INSIGHTS_STATISTICS_DELAY + 1)
+        buckets: dict[datetime, dict[str, Any]] = {}
+        for point in points:
+            start = dt_util.parse_datetime(str(point.get("timestamp")))
+            if start is None or start.tzinfo is None:
+                continue
+
+            # Statistics are hourly, other buckets can not be imported
+            start = dt_util.as_utc(start)
+            if start.minute or start.second or start.microsecond or start > cutoff:
+                continue
+            buckets[start] = point
+
+        return sorted(buckets.items(), key=lambda bucket: bucket[0])
+
+    async def _async_last_statistic(self, statistic_id: str) -> tuple[float, float]:
+        """Get the start timestamp and sum of the last imported statistic."""
+        if (last := self._last_statistics.get(statistic_id)) is not None:
+            return last
+
+        last_stats = await get_instance(self._hass).async_add_executor_job(
+            get_last_statistics, self._hass, 1, statistic_id, True, {"sum"}
+        )
+        if rows := last_stats.get(statistic_id):
+            last = (float(rows[0]["start"]), float(rows[0].get("sum") or 0.0))
+        else:
+            last = (0.0, 0.0)
+
+        self._last_statistics[statistic_id] = last
+        return last
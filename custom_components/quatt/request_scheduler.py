@@ -0,0 +1,134 @@
+"""Rate limiting scheduler for the requests to the Quatt API."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from enum import IntEnum
+import heapq
+import itertools
+import logging
+import time
+
+from homeassistant.core import HomeAssistant
+
+from .const import (
+    DOMAIN,
+    REMOTE_REQUEST_BURST,
+    REMOTE_REQUEST_RATE,
+    REMOTE_RETRY_AFTER_DEFAULT,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class RequestPriority(IntEnum):
+    """Priority of a request, lower values are sent first."""
+
+    INTERACTIVE = 0
+    POLL = 1
+    INSIGHTS = 2
+
+
+def parse_retry_after(value: str | None) -> float:
+    """Get the delay (seconds) from a Retry-After header, seconds or HTTP date."""
+    if not value:
+        return REMOTE_RETRY_AFTER_DEFAULT
+
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return REMOTE_RETRY_AFTER_DEFAULT
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)  # noqa: UP017
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)  # noqa: UP017
+
+
+class QuattRequestScheduler:
+    """Token bucket scheduler for the requests of a Quatt account.
+
+    Every request takes a token, tokens are added at REMOTE_REQUEST_RATE per
+    second up to REMOTE_REQUEST_BURST. Waiting requests are released in order of
+    priority and then in order of arrival. After a rate limited response no
+    request is released until the Retry-After delay has passed.
+    """
+
+    def __init__(
+        self,
+        rate: float = REMOTE_REQUEST_RATE,
+        burst: int = REMOTE_REQUEST_BURST,
+    ) -> None:
+        """Initialize the scheduler."""
+        self._rate = rate
+        self._burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._sequence = itertools.count()
+        self._waiters: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._timer: asyncio.TimerHandle | None = None
+
+    async def async_acquire(self, priority: RequestPriority) -> None:
+        """Wait until the request may be sent."""
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+        self._release()
+        await future
+
+    def retry_after(self, delay: float) -> None:
+        """Hold all requests for the delay (seconds) after a rate limited response."""
+        paused_until = time.monotonic() + delay
+        if paused_until <= self._paused_until:
+            return
+
+        _LOGGER.warning("Quatt API rate limit reached, pausing requests for %ss", delay)
+        self._paused_until = paused_until
+        self._tokens = 0.0
+        self._release()
+
+    def _release(self) -> None:
+        """Release the waiting requests for the available tokens."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        now = time.monotonic()
+        self._tokens = min(
+            self._tokens + (now - self._updated) * self._rate, self._burst
+        )
+        self._updated = now
+
+        # Drop the requests that are no longer waiting (cancelled)
+        while self._waiters and self._waiters[0][2].done():
+            heapq.heappop(self._waiters)
+
+        if now < self._paused_until:
+            delay = self._paused_until - now
+        else:
+            while self._waiters and self._tokens >= 1:
+                _priority, _sequence, future = heapq.heappop(self._waiters)
+                if not future.done():
+                    self._tokens -= 1
+                    future.set_result(None)
+            delay = (1 - self._tokens) / self._rate
+
+        if self._waiters:
+            self._timer = asyncio.get_running_loop().call_later(delay, self._release)
+
+
+def get_account_request_scheduler(
+    hass: HomeAssistant, account_id: str
+) -> QuattRequestScheduler:
+    """Get the request scheduler shared by all CICs of the account."""
+    schedulers: dict[str, QuattRequestScheduler] = hass.data.setdefault(
+        f"_{DOMAIN}_request_schedulers", {}
+    )
+    if account_id not in schedulers:
+        schedulers[account_id] = QuattRequestScheduler()
+    return schedulers[account_id]
@@ -38,7 +38,9 @@ from .const import (
 )
 from .coordinator import QuattDataUpdateCoordinator
 from .entity import (
+    QuattCopSensor,
     QuattFeatureFlags,
+    QuattInsightsSensor,
     QuattSensor,
     QuattSensorEntityDescription,
     QuattSystemSensor,
@@ -264,6 +266,33 @@ def create_heatpump_sensor_entity_descriptions(
     ]
 
 
+def create_insights_period_sensor_entity_descriptions() -> (
+    list[QuattSensorEntityDescription]
+):
+    """Create the sensor entity descriptions for the insights of the current periods."""
+    return [
+        QuattSensorEntityDescription(
+            name=name,
+            key=f"periods.{timeframe}",
+            icon="mdi:chart-bar",
+            native_unit_of_measurement=UnitOfEnergy.WATT_HOUR,
+            device_class=SensorDeviceClass.ENERGY,
+            suggested_display_precision=0,
+            quatt_entity_class=QuattInsightsSensor,
+            quatt_features=QuattFeatureFlags(
+                mobile_api=True,
+            ),
+        )
+        for timeframe, name in (
+            ("day", "Day"),
+            ("week", "Week"),
+            ("month", "Month"),
+            ("year", "Year"),
+            ("all", "All"),
+        )
+    ]
+
+
 SENSORS = {
     # The HUB CIC sensor must be created first to ensure the HUB device is present
     DEVICE_CIC_ID: [
@@ -290,6 +319,7 @@ SENSORS = {
             native_unit_of_measurement="CoP",
             suggested_display_precision=2,
             state_class=SensorStateClass.MEASUREMENT,
+            quatt_entity_class=QuattCopSensor,
         ),
         QuattSensorEntityDescription(
             name="Total power input",
@@ -335,6 +365,82 @@ SENSORS = {
             suggested_display_precision=2,
             state_class=SensorStateClass.MEASUREMENT,
         ),
+        QuattSensorEntityDescription(
+            name="Heat energy",
+            key="computedHeatEnergy",
+            icon="mdi:heat-wave",
+            native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+            device_class=SensorDeviceClass.ENERGY,
+            suggested_display_precision=2,
+            state_class=SensorStateClass.TOTAL_INCREASING,
+        ),
+        QuattSensorEntityDescription(
+            name="Total energy",
+            key="computedEnergy",
+            icon="mdi:heat-wave",
+            native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+            device_class=SensorDeviceClass.ENERGY,
+            suggested_display_precision=2,
+            state_class=SensorStateClass.TOTAL_INCREASING,
+        ),
+        QuattSensorEntityDescription(
+            name="Total energy input",
+            key="computedEnergyInput",
+            icon="mdi:lightning-bolt",
+            native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+            device_class=SensorDeviceClass.ENERGY,
+            suggested_display_precision=2,
+            state_class=SensorStateClass.TOTAL_INCREASING,
+        ),
+        QuattSensorEntityDescription(
+            name="Average COP 15 minutes",
+            key="computedAverageCop15m",
+            icon="mdi:heat-pump",
+            native_unit_of_measurement="CoP",
+            suggested_display_precision=2,
+            state_class=SensorStateClass.MEASUREMENT,
+        ),
+        QuattSensorEntityDescription(
+            name="Average COP 1 hour",
+            key="computedAverageCop1h",
+            icon="mdi:heat-pump",
+            native_unit_of_measurement="CoP",
+            suggested_display_precision=2,
+            state_class=SensorStateClass.MEASUREMENT,
+        ),
+        QuattSensorEntityDescription(
+            name="Average Quatt COP 15 minutes",
+            key="computedAverageQuattCop15m",
+            icon="mdi:heat-pump",
+            native_unit_of_measurement="CoP",
+            suggested_display_precision=2,
+            state_class=SensorStateClass.MEASUREMENT,
+        ),
+        QuattSensorEntityDescription(
+            name="Average Quatt COP 1 hour",
+            key="computedAverageQuattCop1h",
+            icon="mdi:heat-pump",
+            native_unit_of_measurement="CoP",
+            suggested_display_precision=2,
+            state_class=SensorStateClass.MEASUREMENT,
+        ),
+        QuattSensorEntityDescription(
+            name="Average heat power 1 hour",
+            key="computedAverageHeatPower1h",
+            icon="mdi:heat-wave",
+            native_unit_of_measurement=UnitOfPower.WATT,
+            device_class=SensorDeviceClass.POWER,
+            suggested_display_precision=0,
+            state_class=SensorStateClass.MEASUREMENT,
+        ),
+        QuattSensorEntityDescription(
+            name="Compressor duty cycle 1 hour",
+            key="computedCompressorDutyCycle1h",
+            icon="mdi:percent",
+            native_unit_of_measurement=PERCENTAGE,
+            suggested_display_precision=0,
+            state_class=SensorStateClass.MEASUREMENT,
+        ),
         QuattSensorEntityDescription(
             name="QC supervisory control mode code",
             key="qc.supervisoryControlMode",
@@ -880,6 +986,18 @@ SENSORS = {
                 hybrid=True,
             ),
         ),
+        QuattSensorEntityDescription(
+            name="Heat energy",
+            key="boiler.computedBoilerHeatEnergy",
+            icon="mdi:heat-wave",
+            native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+            device_class=SensorDeviceClass.ENERGY,
+            suggested_display_precision=2,
+            state_class=SensorStateClass.TOTAL_INCREASING,
+            quatt_features=QuattFeatureFlags(
+                hybrid=True,
+            ),
+        ),
         QuattSensorEntityDescription(
             name="Boiler power",
             key="boilerPower",
@@ -1121,6 +1239,7 @@ SENSORS = {
                 mobile_api=True,
             ),
         ),
+        *create_insights_period_sensor_entity_descriptions(),
     ],
 }
 
@@ -1133,6 +1252,7 @@ async def async_setup_entry(hass: HomeAssistant, entry, async_add_devices):
 
     local_coordinator: QuattDataUpdateCoordinator = coordinators["local"]
     remote_coordinator: QuattDataUpdateCoordinator = coordinators["remote"]
+    insights_coordinator: QuattDataUpdateCoordinator = coordinators["insights"]
 
     sensors: list[QuattSensor] = []
     sensors += await async_setup_entities(
@@ -1152,6 +1272,21 @@ async def async_setup_entry(hass: HomeAssistant, entry, async_add_devices):
             remote=True,
             entity_descriptions=SENSORS,
             entity_domain=SENSOR_DOMAIN,
+            entity_devices=[
+                device_id for device_id in SENSORS if device_id != DEVICE_INSIGHTS_ID
+            ],
+        )
+
+    # The insights sensors are updated by their own coordinator
+    if insights_coordinator:
+        sensors += await async_setup_entities(
+            hass=hass,
+            coordinator=insights_coordinator,
+            entry=entry,
+            remote=True,
+            entity_descriptions=SENSORS,
+            entity_domain=SENSOR_DOMAIN,
+            entity_devices=[DEVICE_INSIGHTS_ID],
         )
 
     async_add_devices(sensors)
@@ -0,0 +1,189 @@
+"""Coalescing queue for the settings writes of a CIC."""
+
+from __future__ import annotations
+
+import asyncio
+import copy
+import logging
+from typing import TYPE_CHECKING, Any
+
+from .const import SETTINGS_CONFIRM_DELAY, SETTINGS_WRITE_DELAY
+
+if TYPE_CHECKING:
+    from .coordinator_remote import QuattRemoteDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _deep_merge(target: dict[str, Any], source: dict[str, Any]) -> None:
+    """Merge source into target, nested dicts are merged instead of replaced."""
+    for key, value in source.items():
+        if isinstance(value, dict) and isinstance(target.get(key), dict):
+            _deep_merge(target[key], value)
+        else:
+            target[key] = value
+
+
+def _lookup(settings: dict[str, Any], value_path: str) -> tuple[bool, Any]:
+    """Find a value by dot notation, returns whether it was found and the value."""
+    current_node: Any = settings
+    for part in value_path.split("."):
+        if not isinstance(current_node, dict) or part not in current_node:
+            return False, None
+        current_node = current_node[part]
+    return True, current_node
+
+
+def _flatten(settings: dict[str, Any], prefix: str = "") -> dict[str, Any]:
+    """Flatten nested settings to a dict of dot notation paths and values."""
+    flat: dict[str, Any] = {}
+    for key, value in settings.items():
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{prefix}{key}."))
+        else:
+            flat[f"{prefix}{key}"] = value
+    return flat
+
+
+class QuattSettingsQueue:
+    """Coalesce the settings writes of a CIC into a single update.
+
+    Settings written within SETTINGS_WRITE_DELAY seconds are merged (in order of
+    writing) into one update of the CIC settings. Updates are sent one at a time
+    in order. Every writer gets the result of the update that contained its
+    settings.
+
+    A successful update is applied to the coordinator data right away. After
+    SETTINGS_CONFIRM_DELAY seconds the coordinator is refreshed once to confirm
+    the written settings, settings the remote API does not report are reverted.
+    """
+
+    def __init__(self, coordinator: QuattRemoteDataUpdateCoordinator) -> None:
+        """Initialize the queue."""
+        self._coordinator = coordinator
+        self._lock = asyncio.Lock()
+        self._pending: dict[str, Any] = {}
+        self._pending_result: asyncio.Future[bool] | None = None
+        self._in_flight: dict[str, Any] = {}
+        self._tasks: set[asyncio.Task[None]] = set()
+        self._unconfirmed: dict[str, Any] = {}
+        self._confirm_timer: asyncio.TimerHandle | None = None
+
+    def get_value(self, value_path: str) -> Any:
+        """Get the value of a setting including the writes that are not done yet."""
+        for settings in (self._pending, self._in_flight):
+            found, value = _lookup(settings, value_path)
+            if found:
+                return value
+        return self._coordinator.get_value(value_path)
+
+    async def async_update(self, settings: dict[str, Any]) -> bool:
+        """Queue a settings update and wait for the result.
+
+        Returns: True if the update containing the settings was successful
+        """
+        _deep_merge(self._pending, settings)
+        if self._pending_result is None:
+            self._pending_result = asyncio.get_running_loop().create_future()
+            self._create_task(self._async_write_pending())
+
+        # The update is shared, so a cancelled writer must not cancel it
+        return await asyncio.shield(self._pending_result)
+
+    def _create_task(self, coro) -> None:
+        """Run a coroutine as task that is cancelled with the queue."""
+        task = asyncio.get_running_loop().create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _async_write_pending(self) -> None:
+        """Write the pending settings after the coalescing delay."""
+        await asyncio.sleep(SETTINGS_WRITE_DELAY)
+
+        # Wait for the previous update, so the updates are sent in order
+        async with self._lock:
+            settings, result = self._pending, self._pending_result
+            self._pending, self._pending_result = {}, None
+            if result is None:
+                return
+
+            self._in_flight = settings
+            _LOGGER.debug("Writing coalesced CIC settings: %s", settings)
+            try:
+                success = await self._coordinator.client.update_cic_settings(settings)
+            except Exception as err:
+                result.set_exception(err)
+                return
+            else:
+                result.set_result(success)
+            finally:
+                self._in_flight = {}
+                # Cancelled while writing, the writers must not wait forever
+                if not result.done():
+                    result.cancel()
+
+        if success:
+            self._apply_settings(settings)
+
+    def _apply_settings(self, settings: dict[str, Any]) -> None:
+        """Apply written settings to the coordinator data and schedule the confirmation."""
+        if not isinstance(self._coordinator.data, dict):
+            # Nothing to update, fetch the data instead
+            self._create_task(self._coordinator.async_request_refresh())
+            return
+
+        data = copy.deepcopy(self._coordinator.data)
+        _deep_merge(data.get("result", data), settings)
+        self._unconfirmed.update(_flatten(settings))
+        self._coordinator.async_set_updated_data(data)
+
+        # Confirm all settings written in a short time with a single request
+        if self._confirm_timer is not None:
+            self._confirm_timer.cancel()
+        self._confirm_timer = asyncio.get_running_loop().call_later(
+            SETTINGS_CONFIRM_DELAY, self._handle_confirm_timer
+        )
+
+    def _handle_confirm_timer(self) -> None:
+        """Start the confirmation of the written settings."""
+        self._confirm_timer = None
+        self._create_task(self._async_confirm_settings())
+
+    async def _async_confirm_settings(self) -> None:
+        """Refresh the CIC data and report the settings that were not applied.
+
+        The refresh is a conditional request of the CIC data only, the data of
+        the remote API replaces the written settings it does not report.
+        """
+        # A running update is confirmed by its own timer
+        async with self._lock:
+            expected, self._unconfirmed = self._unconfirmed, {}
+
+        await self._coordinator.async_refresh()
+        data = self._coordinator.data
+        if not self._coordinator.last_update_success or not isinstance(data, dict):
+            # Keep the written settings, the next update gets the actual values
+            _LOGGER.debug("Could not confirm CIC settings: %s", expected)
+            return
+
+        for value_path, value in expected.items():
+            found, actual = _lookup(data.get("result", data), value_path)
+            if found and actual != value:
+                _LOGGER.warning(
+                    "CIC setting %s is %s instead of the written %s, "
+                    "using the value reported by the remote API",
+                    value_path,
+                    actual,
+                    value,
+                )
+
+    def cancel(self) -> None:
+        """Cancel the pending settings writes and confirmation."""
+        if self._confirm_timer is not None:
+            self._confirm_timer.cancel()
+            self._confirm_timer = None
+        for task in list(self._tasks):
+            task.cancel()
+        if self._pending_result is not None and not self._pending_result.done():
+            self._pending_result.cancel()
+        self._pending, self._pending_result = {}, None
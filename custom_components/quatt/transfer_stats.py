@@ -0,0 +1,128 @@
+"""Accounting of the data transferred from the Quatt API."""
+
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+from datetime import date
+import logging
+from typing import Any
+
+import homeassistant.util.dt as dt_util
+
+from .const import TRANSFER_STATS_DAYS, TRANSFER_STATS_SAVE_DELAY
+
+try:
+    from aiohttp.compression_utils import HAS_BROTLI
+except ImportError:
+    HAS_BROTLI = False
+
+_LOGGER = logging.getLogger(__name__)
+
+# Encodings the session can decode, brotli depends on an optional package
+ACCEPT_ENCODING = "gzip, deflate, br" if HAS_BROTLI else "gzip, deflate"
+
+
+@dataclass(slots=True)
+class TransferTotals:
+    """Number of requests and bytes received as transferred and as decoded.
+
+    The transferred and decoded bytes only include the responses of which the
+    transferred size is known, the others are counted as unknown.
+    """
+
+    requests: int = 0
+    transferred_bytes: int = 0
+    decoded_bytes: int = 0
+    unknown_transferred_requests: int = 0
+    unknown_transferred_decoded_bytes: int = 0
+
+    def add(self, transferred_bytes: int | None, decoded_bytes: int) -> None:
+        """Add a response."""
+        self.requests += 1
+        if transferred_bytes is None:
+            self.unknown_transferred_requests += 1
+            self.unknown_transferred_decoded_bytes += decoded_bytes
+            return
+        self.transferred_bytes += transferred_bytes
+        self.decoded_bytes += decoded_bytes
+
+
+class TransferStats:
+    """Bytes received from the Quatt API per endpoint and per day.
+
+    The transferred size is the size of the (compressed) response as counted by
+    aiohttp, or its Content-Length for older aiohttp versions. Compressed
+    responses without it are counted with an unknown transferred size. Only the
+    last TRANSFER_STATS_DAYS days are kept. The totals per day are persisted when
+    a store is given, the totals per endpoint count since the start.
+    """
+
+    def __init__(self, store=None) -> None:
+        """Initialize."""
+        self._store = store
+        self._save_pending = False
+        self._started = dt_util.utcnow()
+        self._endpoints: dict[str, TransferTotals] = {}
+        self._days: dict[date, TransferTotals] = {}
+
+    def add(
+        self, endpoint: str, transferred_bytes: int | None, decoded_bytes: int
+    ) -> None:
+        """Add a response of the endpoint, the transferred size may be unknown."""
+        self._endpoints.setdefault(endpoint, TransferTotals()).add(
+            transferred_bytes, decoded_bytes
+        )
+
+        today = dt_util.now().date()
+        if today not in self._days:
+            self._days[today] = TransferTotals()
+            for day in sorted(self._days)[:-TRANSFER_STATS_DAYS]:
+                del self._days[day]
+        self._days[today].add(transferred_bytes, decoded_bytes)
+
+        if self._store:
+            self._save_pending = True
+            self._store.async_delay_save(self._data_to_store, TRANSFER_STATS_SAVE_DELAY)
+
+    async def async_load(self) -> None:
+        """Load the totals per day from storage."""
+        if not self._store or not (stored := await self._store.async_load()):
+            return
+
+        for day, totals in stored.get("days", {}).items():
+            try:
+                self._days[date.fromisoformat(day)] = TransferTotals(**totals)
+            except (TypeError, ValueError) as err:
+                _LOGGER.debug("Ignoring stored transfer totals of %s: %s", day, err)
+        for day in sorted(self._days)[:-TRANSFER_STATS_DAYS]:
+            del self._days[day]
+
+    async def async_save(self) -> None:
+        """Write pending changes of the totals per day to storage immediately."""
+        if self._store and self._save_pending:
+            await self._store.async_save(self._data_to_store())
+
+    def _data_to_store(self) -> dict[str, Any]:
+        """Return the totals per day to store."""
+        self._save_pending = False
+        return {
+            "days": {
+                day.isoformat(): asdict(totals)
+                for day, totals in sorted(self._days.items())
+            }
+        }
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the statistics for diagnostics."""
+        return {
+            "accept_encoding": ACCEPT_ENCODING,
+            "endpoints_since": self._started.isoformat(),
+            "endpoints": {
+                endpoint: asdict(totals)
+                for endpoint, totals in sorted(self._endpoints.items())
+            },
+            "days": {
+                day.isoformat(): asdict(totals)
+                for day, totals in sorted(self._days.items())
+            },
+        }
@@ -0,0 +1,84 @@
+"""Interpolated water property table for the heat power computations."""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Mapping
+from typing import TYPE_CHECKING
+
+from .const import CONVERSION_FACTORS
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+class ConversionFactorTable:
+    """Array backed conversion factor table with linear interpolation.
+
+    The table points must be equidistant so the segment of a temperature can be
+    found by index instead of searching. Between two points the conversion factor
+    is linearly interpolated, outside the table the nearest end point is used.
+    """
+
+    __slots__ = ("_factors", "_last_segment", "_slopes", "_start", "_step")
+
+    def __init__(self, factors: Mapping[float, float]) -> None:
+        """Initialize the table from a temperature to conversion factor mapping."""
+        temperatures = sorted(factors)
+        if len(temperatures) < 2:
+            raise ValueError("At least two table points are required")
+
+        self._start = float(temperatures[0])
+        self._step = float(temperatures[1] - temperatures[0])
+        for index, temperature in enumerate(temperatures):
+            if temperature != self._start + index * self._step:
+                raise ValueError("Table points must be equidistant")
+
+        self._factors = array("d", (factors[t] for t in temperatures))
+        self._slopes = array(
+            "d",
+            (
+                (self._factors[index + 1] - self._factors[index]) / self._step
+                for index in range(len(temperatures) - 1)
+            ),
+        )
+        self._last_segment = len(self._slopes) - 1
+
+    def conversion_factor(self, temperature: float) -> float:
+        """Get the interpolated conversion factor for a temperature."""
+        offset = temperature - self._start
+        if offset <= 0:
+            return self._factors[0]
+
+        index = int(offset / self._step)
+        if index > self._last_segment:
+            return self._factors[-1]
+
+        return self._factors[index] + self._slopes[index] * (
+            offset - index * self._step
+        )
+
+    def conversion_factors(self, temperatures: np.ndarray) -> np.ndarray:
+        """Get the interpolated conversion factors for an array of temperatures.
+
+        Performs the same operations as conversion_factor so the results are
+        identical. NaN temperatures result in NaN.
+        """
+        import numpy as np  # pylint: disable=import-outside-toplevel
+
+        factors = np.frombuffer(self._factors, dtype=float)
+        slopes = np.frombuffer(self._slopes, dtype=float)
+
+        offset = np.asarray(temperatures, dtype=float) - self._start
+        valid = ~np.isnan(offset)
+        index = np.zeros(offset.shape, dtype=int)
+        index[valid] = (offset[valid] / self._step).astype(int)
+        index = np.clip(index, 0, self._last_segment)
+
+        value = factors[index] + slopes[index] * (offset - index * self._step)
+        value = np.where(offset <= 0, factors[0], value)
+        value = np.where(offset >= len(slopes) * self._step, factors[-1], value)
+        return np.where(valid, value, np.nan)
+
+
+CONVERSION_FACTOR_TABLE = ConversionFactorTable(CONVERSION_FACTORS)